@@ -0,0 +1,58 @@
+# benchmark_persistente.py
+#
+# Compara el costo de tomar una vista fija del diccionario mientras se edita:
+#   - copy.deepcopy del DiccionarioBST mutable (lo que haría falta sin copiar())
+#   - DiccionarioBST.copiar(), copia iterativa O(n)
+#   - DiccionarioPersistente.copiar(), O(1) compartiendo los nodos
+# y cuánto más cuesta cada edición con copia de camino.
+#
+# Uso: python benchmark_persistente.py [cantidad_de_palabras]
+
+import sys
+import copy
+import random
+import time
+
+from bst import DiccionarioBST, DiccionarioPersistente
+
+
+def medir(funcion, repeticiones):
+    """Devuelve el tiempo promedio (en segundos) de llamar a ``funcion``."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    pares = [(f"palabra{i:07d}", f"word{i}") for i in range(n)]
+    random.seed(0)
+    random.shuffle(pares)
+
+    mutable = DiccionarioBST(balanceado=True)
+    persistente = DiccionarioPersistente(balanceado=True)
+    tiempo_mutable = medir(lambda: [mutable.insertar_par(p, t) for p, t in pares], 1)
+    tiempo_persistente = medir(lambda: [persistente.insertar_par(p, t) for p, t in pares], 1)
+
+    print(f"Diccionario de {n} palabras\n")
+    print("Inserción (por palabra):")
+    print(f"  DiccionarioBST          {tiempo_mutable / n * 1e6:10.2f} µs")
+    print(f"  DiccionarioPersistente  {tiempo_persistente / n * 1e6:10.2f} µs")
+
+    print("\nTomar una vista fija del árbol:")
+    print(f"  copy.deepcopy           {medir(lambda: copy.deepcopy(mutable), 1) * 1e3:10.2f} ms")
+    print(f"  DiccionarioBST.copiar   {medir(mutable.copiar, 3) * 1e3:10.2f} ms")
+    print(f"  Persistente.copiar      {medir(persistente.copiar, 10000) * 1e6:10.2f} µs")
+
+    # Escenario de exportación: se toma la vista y se siguen haciendo ediciones
+    ediciones = [(f"nueva{i}", "new") for i in range(1000)]
+    vista = persistente.copiar()
+    for palabra, traduccion in ediciones:
+        persistente.insertar_par(palabra, traduccion)
+    assert len(vista) == n and len(persistente) == n + len(ediciones)
+    print(f"\nLa vista tomada antes de {len(ediciones)} ediciones sigue teniendo {len(vista)} palabras.")
+
+
+if __name__ == "__main__":
+    main()
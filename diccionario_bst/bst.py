@@ -1,126 +1,984 @@
 # bst.py
 
+import sys
+from itertools import islice
+
+from difuso import IndiceDifuso, mas_parecidas
+from intercalacion import normalizar, obtener_intercalacion
+
+
 class Nodo:
-    """Representa un nodo en el Arbol Binario de Búsqueda (BST)."""
-    def __init__(self, palabra, traduccion):
-        # Aseguramos que la palabra se guarde en minúsculas para una búsqueda consistente
-        self.palabra = palabra.lower()
+    """Representa un nodo en el Arbol Binario de Búsqueda (BST).
+
+    Usa ``__slots__`` para no reservar un ``__dict__`` por nodo: con millones
+    de entradas eso reduce a menos de la mitad la memoria de cada nodo.
+    """
+    __slots__ = ("palabra", "traduccion", "clave", "izq", "der", "altura", "tam")
+
+    def __init__(self, palabra, traduccion, clave=None):
+        # La palabra llega ya normalizada (ver intercalacion.normalizar).
+        # Se interna para que las comparaciones y las copias compartan la misma cadena.
+        self.palabra = sys.intern(palabra)
         self.traduccion = traduccion
+        # Clave de orden según la intercalación del diccionario, calculada una
+        # sola vez; si coincide con la palabra se comparte la misma cadena
+        self.clave = self.palabra if clave is None or clave is palabra else clave
         self.izq = None
         self.der = None
+        # Altura del sub-árbol que cuelga de este nodo (una hoja mide 1)
+        self.altura = 1
+        # Cantidad de nodos del sub-árbol; permite consultas por posición en O(log n)
+        self.tam = 1
+
+
+def _altura(nodo):
+    return nodo.altura if nodo is not None else 0
+
+
+def _tam(nodo):
+    return nodo.tam if nodo is not None else 0
+
+
+def _copiar_nodo(nodo):
+    """Copia los datos de un nodo (sin sus hijos); la palabra ya está normalizada."""
+    copia = Nodo.__new__(Nodo)
+    copia.palabra = nodo.palabra
+    copia.traduccion = nodo.traduccion
+    copia.clave = nodo.clave
+    copia.izq = None
+    copia.der = None
+    copia.altura = nodo.altura
+    copia.tam = nodo.tam
+    return copia
+
+
+# Una palabra puede tener varias traducciones; se guardan en el mismo campo
+# separadas por comas, así los archivos de texto y los snapshots no cambian.
+SEPARADOR_TRADUCCIONES = ", "
+
+
+def separar_traducciones(traduccion):
+    """Devuelve la lista de traducciones guardadas en ``traduccion``, sin repetidas."""
+    resultado = []
+    vistas = set()
+    for parte in traduccion.split(","):
+        parte = parte.strip()
+        if parte and parte.lower() not in vistas:
+            vistas.add(parte.lower())
+            resultado.append(parte)
+    return resultado
+
+
+def unir_traducciones(traducciones):
+    return SEPARADOR_TRADUCCIONES.join(traducciones)
+
+
+def _clonar_nodo(nodo):
+    """Copia un nodo conservando los enlaces a sus hijos (que quedan compartidos)."""
+    copia = _copiar_nodo(nodo)
+    copia.izq = nodo.izq
+    copia.der = nodo.der
+    return copia
+
 
 class DiccionarioBST:
-    """Implementa la estructura del Diccionario usando un BST."""
-    def __init__(self):
+    """Implementa la estructura del Diccionario usando un BST.
+
+    Con ``balanceado=True`` el árbol se comporta como un AVL: después de cada
+    inserción o eliminación se aplican rotaciones para que la altura se
+    mantenga en O(log n) sin importar el orden de inserción.
+
+    Con ``indice_hash=True`` se mantiene además un ``dict`` palabra -> traducción
+    sincronizado con el árbol, de modo que ``buscar_traduccion`` es O(1); el
+    orden de ``inorder()`` y las consultas por rango siguen saliendo del árbol.
+
+    Con ``indice_inverso=True`` se mantiene un índice traducción -> palabras
+    (por cada una de las traducciones de una entrada), así ``buscar_inversa``
+    responde en O(1) en lugar de recorrer todo el diccionario.
+
+    Con ``indice_difuso=True`` se mantiene un ``IndiceDifuso`` con las palabras,
+    que permite a ``sugerencias`` proponer palabras parecidas (errores de
+    tipeo) sin comparar contra todo el diccionario.
+
+    ``intercalacion`` ("codigo" o "espanol", ver ``intercalacion.py``) define el
+    orden alfabético. Cada nodo guarda su clave de orden y cada consulta se
+    normaliza una sola vez, así que al recorrer el árbol sólo se comparan
+    claves ya calculadas.
+    """
+    def __init__(self, balanceado=False, indice_hash=False, indice_inverso=False,
+                 indice_difuso=False, intercalacion="codigo"):
         self.raiz = None
+        self.balanceado = balanceado
+        self.intercalacion = obtener_intercalacion(intercalacion)
+        self._indice = {} if indice_hash else None
+        self._inverso = {} if indice_inverso else None
+        self._difuso = IndiceDifuso() if indice_difuso else None
+
+    def __len__(self):
+        return _tam(self.raiz)
+
+    def __contains__(self, palabra):
+        palabra = normalizar(palabra)
+        if self._indice is not None:
+            return palabra in self._indice
+        return self._buscar_nodo(self.intercalacion.clave(palabra)) is not None
+
+    def _clave(self, palabra):
+        """Normaliza ``palabra`` y devuelve (palabra, clave de orden)."""
+        palabra = normalizar(palabra)
+        return palabra, self.intercalacion.clave(palabra)
+
+    def copiar(self):
+        """Devuelve una copia independiente del diccionario, con la misma forma.
+
+        Es O(n) y no usa recursión. Sirve para tener una vista fija del árbol
+        (por ejemplo, para guardarlo desde otro hilo) mientras éste sigue cambiando.
+        El índice difuso no se copia porque es el más grande y sólo sirve para
+        ``sugerencias``, que en la copia recorre todo el árbol.
+        """
+        copia = type(self)(balanceado=self.balanceado, indice_hash=self._indice is not None,
+                           indice_inverso=self._inverso is not None,
+                           intercalacion=self.intercalacion)
+        if self._indice is not None:
+            copia._indice = dict(self._indice)
+        if self._inverso is not None:
+            copia._inverso = {traduccion: set(palabras) for traduccion, palabras in self._inverso.items()}
+        if self.raiz is None:
+            return copia
+
+        copia.raiz = _copiar_nodo(self.raiz)
+        pila = [(self.raiz, copia.raiz)]
+        while pila:
+            original, nuevo = pila.pop()
+            if original.izq is not None:
+                nuevo.izq = _copiar_nodo(original.izq)
+                pila.append((original.izq, nuevo.izq))
+            if original.der is not None:
+                nuevo.der = _copiar_nodo(original.der)
+                pila.append((original.der, nuevo.der))
+        return copia
+
+    # --- Índices auxiliares ---
+    # Se llaman cada vez que una palabra entra, cambia o sale del árbol.
+    # Al reemplazar, ``anterior`` es la traducción que tenía la palabra.
+
+    def _indexar(self, palabra, traduccion, anterior=None):
+        if self._indice is not None:
+            self._indice[palabra] = traduccion
+        if self._inverso is not None:
+            if anterior is not None:
+                self._quitar_inverso(palabra, anterior)
+            self._agregar_inverso(palabra, traduccion)
+        if self._difuso is not None and anterior is None:
+            # Un reemplazo no cambia la palabra, sólo las palabras nuevas entran
+            self._difuso.agregar(palabra)
+
+    def _desindexar(self, palabra, traduccion):
+        if self._indice is not None:
+            del self._indice[palabra]
+        if self._inverso is not None:
+            self._quitar_inverso(palabra, traduccion)
+        if self._difuso is not None:
+            self._difuso.quitar(palabra)
+
+    def _agregar_inverso(self, palabra, traduccion):
+        for parte in separar_traducciones(traduccion):
+            self._inverso.setdefault(parte.lower(), set()).add(palabra)
+
+    def _quitar_inverso(self, palabra, traduccion):
+        for parte in separar_traducciones(traduccion):
+            palabras = self._inverso.get(parte.lower())
+            if palabras is not None:
+                palabras.discard(palabra)
+                if not palabras:
+                    del self._inverso[parte.lower()]
+
+    @classmethod
+    def from_pairs(cls, pares, presorted=False, balanceado=True, indice_hash=False,
+                   indice_inverso=False, indice_difuso=False, intercalacion="codigo"):
+        """Construye en O(n) un árbol perfectamente balanceado a partir de pares.
+
+        ``pares`` es un iterable de (palabra, traduccion). Si una palabra se repite
+        gana la última traducción, igual que al reemplazar con ``insertar_par``.
+        Con ``presorted=True`` se asume que los pares ya vienen ordenados según
+        ``intercalacion`` y se evita ordenarlos otra vez.
+        """
+        clave = obtener_intercalacion(intercalacion).clave
+        palabras = []
+        traducciones = []
+        if presorted:
+            for palabra, traduccion in pares:
+                palabra = normalizar(palabra)
+                if palabras and palabras[-1] == palabra:
+                    traducciones[-1] = traduccion
+                else:
+                    palabras.append(palabra)
+                    traducciones.append(traduccion)
+        else:
+            # El diccionario elimina duplicados quedándose con la última traducción
+            unicos = {}
+            for palabra, traduccion in pares:
+                unicos[normalizar(palabra)] = traduccion
+            palabras = sorted(unicos, key=clave)
+            traducciones = [unicos[palabra] for palabra in palabras]
+        claves = [clave(palabra) for palabra in palabras]
+
+        bst = cls(balanceado=balanceado, indice_hash=indice_hash, indice_inverso=indice_inverso,
+                  intercalacion=intercalacion)
+        bst.raiz = bst._construir_balanceado(palabras, traducciones, claves, 0, len(palabras))
+        if indice_hash:
+            bst._indice = dict(zip(palabras, traducciones))
+        if indice_inverso:
+            for palabra, traduccion in zip(palabras, traducciones):
+                bst._agregar_inverso(palabra, traduccion)
+        if indice_difuso:
+            bst._difuso = IndiceDifuso(palabras)
+        return bst
+
+    def _construir_balanceado(self, palabras, traducciones, claves, inicio, fin):
+        """Arma el sub-árbol con las palabras[inicio:fin] usando la del medio como raíz.
+
+        La recursión sólo llega a profundidad log2(n), así que no hay riesgo de
+        superar el límite de Python.
+        """
+        if inicio >= fin:
+            return None
+        medio = (inicio + fin) // 2
+        nodo = Nodo(palabras[medio], traducciones[medio], claves[medio])
+        nodo.izq = self._construir_balanceado(palabras, traducciones, claves, inicio, medio)
+        nodo.der = self._construir_balanceado(palabras, traducciones, claves, medio + 1, fin)
+        # En un árbol armado así, con m nodos la altura es exactamente m.bit_length()
+        nodo.tam = fin - inicio
+        nodo.altura = nodo.tam.bit_length()
+        return nodo
+
+    # Todas las operaciones son iterativas (con pilas explícitas) para que la
+    # profundidad del árbol no dependa del límite de recursión de Python.
 
     def insertar_par(self, palabra, traduccion):
-        palabra = palabra.lower()
+        """Inserta o reemplaza la traducción de ``palabra``.
+
+        Devuelve True si la palabra ya existía (reemplazo) y False si es nueva.
+        """
+        palabra, clave = self._clave(palabra)
         if self.raiz is None:
-            self.raiz = Nodo(palabra, traduccion)
+            self.raiz = Nodo(palabra, traduccion, clave)
+            self._indexar(palabra, traduccion)
+            return False
+
+        # Se guarda el camino desde la raíz para rebalancear de regreso
+        camino = []
+        nodo = self.raiz
+        while nodo is not None:
+            if clave == nodo.clave:
+                # Reemplazar la traducción si la palabra ya existe (actualización)
+                anterior = nodo.traduccion
+                nodo.traduccion = traduccion
+                self._indexar(palabra, traduccion, anterior)
+                return True
+            camino.append(nodo)
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
+
+        padre = camino[-1]
+        if clave < padre.clave:
+            padre.izq = Nodo(palabra, traduccion, clave)
         else:
-            self._insertar_recursivo(self.raiz, palabra, traduccion)
+            padre.der = Nodo(palabra, traduccion, clave)
+        self._rebalancear_camino(camino)
+        self._indexar(palabra, traduccion)
+        return False
 
-    def _insertar_recursivo(self, nodo, palabra, traduccion):
-        if palabra < nodo.palabra:
-            if nodo.izq is None:
-                nodo.izq = Nodo(palabra, traduccion)
-            else:
-                self._insertar_recursivo(nodo.izq, palabra, traduccion)
-        elif palabra > nodo.palabra:
-            if nodo.der is None:
-                nodo.der = Nodo(palabra, traduccion)
+    # --- Balanceo AVL ---
+
+    def _actualizar(self, nodo):
+        """Recalcula la altura y el tamaño del nodo a partir de sus hijos."""
+        nodo.altura = 1 + max(_altura(nodo.izq), _altura(nodo.der))
+        nodo.tam = 1 + _tam(nodo.izq) + _tam(nodo.der)
+
+    def _rotar_derecha(self, nodo):
+        nueva_raiz = nodo.izq
+        nodo.izq = nueva_raiz.der
+        nueva_raiz.der = nodo
+        self._actualizar(nodo)
+        self._actualizar(nueva_raiz)
+        return nueva_raiz
+
+    def _rotar_izquierda(self, nodo):
+        nueva_raiz = nodo.der
+        nodo.der = nueva_raiz.izq
+        nueva_raiz.izq = nodo
+        self._actualizar(nodo)
+        self._actualizar(nueva_raiz)
+        return nueva_raiz
+
+    def _rebalancear(self, nodo):
+        """Actualiza la altura y el tamaño del nodo y, en modo AVL, lo rota si quedó desbalanceado.
+
+        Devuelve la nueva raíz del sub-árbol.
+        """
+        self._actualizar(nodo)
+        if not self.balanceado:
+            return nodo
+
+        balance = _altura(nodo.izq) - _altura(nodo.der)
+        if balance > 1:
+            # Caso izquierda-derecha: primero se rota el hijo
+            if _altura(nodo.izq.izq) < _altura(nodo.izq.der):
+                nodo.izq = self._rotar_izquierda(nodo.izq)
+            return self._rotar_derecha(nodo)
+        if balance < -1:
+            # Caso derecha-izquierda
+            if _altura(nodo.der.der) < _altura(nodo.der.izq):
+                nodo.der = self._rotar_derecha(nodo.der)
+            return self._rotar_izquierda(nodo)
+        return nodo
+
+    def _rebalancear_camino(self, camino):
+        """Rebalancea los nodos de ``camino`` desde el más profundo hasta la raíz.
+
+        Si una rotación cambia la raíz de un sub-árbol, se re-enlaza con su padre.
+        """
+        for i in range(len(camino) - 1, -1, -1):
+            nodo = camino[i]
+            nuevo = self._rebalancear(nodo)
+            if nuevo is nodo:
+                continue
+            if i == 0:
+                self.raiz = nuevo
+            elif camino[i - 1].izq is nodo:
+                camino[i - 1].izq = nuevo
             else:
-                self._insertar_recursivo(nodo.der, palabra, traduccion)
-        else:
-            # Reemplazar la traducción si la palabra ya existe (actualización)
-            nodo.traduccion = traduccion
+                camino[i - 1].der = nuevo
 
     def buscar_traduccion(self, palabra):
-        palabra = palabra.lower()
-        return self._buscar_recursivo(self.raiz, palabra)
+        palabra = normalizar(palabra)
+        if self._indice is not None:
+            return self._indice.get(palabra)
+        nodo = self._buscar_nodo(self.intercalacion.clave(palabra))
+        return nodo.traduccion if nodo is not None else None
 
-    def _buscar_recursivo(self, nodo, palabra):
-        if nodo is None:
+    # --- Traducciones múltiples ---
+
+    def traducciones(self, palabra):
+        """Lista de traducciones de ``palabra`` (vacía si no está)."""
+        traduccion = self.buscar_traduccion(palabra)
+        return separar_traducciones(traduccion) if traduccion is not None else []
+
+    def traduccion_ampliada(self, palabra, traduccion):
+        """Traducción que quedaría al sumar ``traduccion`` a las que ya tiene ``palabra``.
+
+        Devuelve None si ya la tenía. Sirve para guardar o registrar el
+        resultado antes de aplicarlo (como hace ``agregar_traduccion``).
+        """
+        actuales = self.traducciones(palabra)
+        nuevas = separar_traducciones(traduccion)
+        vistas = {actual.lower() for actual in actuales}
+        agregar = [nueva for nueva in nuevas if nueva.lower() not in vistas]
+        if not agregar:
             return None
-        if palabra == nodo.palabra:
-            return nodo.traduccion
-        elif palabra < nodo.palabra:
-            return self._buscar_recursivo(nodo.izq, palabra)
-        else:
-            return self._buscar_recursivo(nodo.der, palabra)
-            
+        return unir_traducciones(actuales + agregar)
+
+    def agregar_traduccion(self, palabra, traduccion):
+        """Suma ``traduccion`` a las de ``palabra`` sin reemplazarlas (o crea la palabra).
+
+        Devuelve False si la palabra ya tenía esa traducción.
+        """
+        combinada = self.traduccion_ampliada(palabra, traduccion)
+        if combinada is None:
+            return False
+        self.insertar_par(palabra, combinada)
+        return True
+
+    def buscar_inversa(self, traduccion):
+        """Palabras (en orden alfabético) que tienen ``traduccion`` entre sus traducciones.
+
+        Con el índice inverso es O(1) más el ordenado del resultado; sin él
+        hay que recorrer todo el diccionario. En los dos casos el orden es el
+        de la intercalación del árbol.
+        """
+        traduccion = traduccion.strip().lower()
+        if self._inverso is not None:
+            return sorted(self._inverso.get(traduccion, ()), key=self.intercalacion.clave)
+        return [
+            palabra for palabra, traducciones in self.inorder()
+            if traduccion in (parte.lower() for parte in separar_traducciones(traducciones))
+        ]
+
+    def sugerencias(self, palabra, limite=5):
+        """Palabras del diccionario parecidas a ``palabra`` (para "¿Quiso decir...?").
+
+        Con el índice difuso sólo se comparan unas pocas candidatas; sin él se
+        compara contra todas las palabras.
+        """
+        palabra = normalizar(palabra)
+        if self._difuso is not None:
+            return self._difuso.sugerencias(palabra, limite)
+        return mas_parecidas(palabra, (palabra for palabra, _ in self.inorder()), limite)
+
+    def _buscar_nodo(self, clave):
+        nodo = self.raiz
+        while nodo is not None:
+            if clave == nodo.clave:
+                return nodo
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
+        return None
+
     # RECORRIDO IN-ORDER (PARA LA LISTA ORDENADA)
     def inorder(self):
         """Generador que devuelve (palabra, traduccion) en orden alfabético."""
-        yield from self._inorder_recursivo(self.raiz)
-
-    def _inorder_recursivo(self, nodo):
-        if nodo is not None:
-            yield from self._inorder_recursivo(nodo.izq)
+        pila = []
+        nodo = self.raiz
+        while pila or nodo is not None:
+            # Bajar todo lo posible por la izquierda
+            while nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.izq
+            nodo = pila.pop()
             # Solo se devuelve el par (palabra, traduccion)
-            yield nodo.palabra, nodo.traduccion 
-            yield from self._inorder_recursivo(nodo.der)
+            yield nodo.palabra, nodo.traduccion
+            nodo = nodo.der
 
     # --- Métodos de Eliminación ---
 
     def eliminar_palabra(self, palabra):
-        palabra = palabra.lower()
-        self.raiz = self._eliminar_recursivo(self.raiz, palabra)
-        # El método recursivo devuelve el nuevo nodo raíz (o None)
-
-    def _eliminar_recursivo(self, nodo, palabra):
+        """Elimina ``palabra``. Devuelve True si estaba en el diccionario."""
+        palabra, clave = self._clave(palabra)
+        if self._indice is not None and palabra not in self._indice:
+            # El índice permite descartar en O(1) las palabras inexistentes
+            return False
+        camino = []
+        nodo = self.raiz
+        while nodo is not None and clave != nodo.clave:
+            camino.append(nodo)
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
         if nodo is None:
-            return nodo
-
-        if palabra < nodo.palabra:
-            nodo.izq = self._eliminar_recursivo(nodo.izq, palabra)
-        elif palabra > nodo.palabra:
-            nodo.der = self._eliminar_recursivo(nodo.der, palabra)
-        else:
-            # Nodo encontrado
-
-            # Caso 1: Cero o un hijo
-            if nodo.izq is None:
-                return nodo.der
-            elif nodo.der is None:
-                return nodo.izq
+            return False
+        self._desindexar(palabra, nodo.traduccion)
 
+        if nodo.izq is not None and nodo.der is not None:
             # Caso 2: Dos hijos
             # Encontrar el sucesor in-order (el más pequeño en el sub-árbol derecho)
-            sucesor = self._min_valor_nodo(nodo.der)
-            
+            camino.append(nodo)
+            sucesor = nodo.der
+            while sucesor.izq is not None:
+                camino.append(sucesor)
+                sucesor = sucesor.izq
+
             # Copiar el contenido del sucesor al nodo actual
             nodo.palabra = sucesor.palabra
             nodo.traduccion = sucesor.traduccion
+            nodo.clave = sucesor.clave
 
-            # Eliminar el sucesor (que ahora está duplicado)
-            nodo.der = self._eliminar_recursivo(nodo.der, sucesor.palabra)
-
-        return nodo
+            # Ahora se elimina el sucesor, que tiene a lo sumo un hijo derecho
+            nodo = sucesor
 
-    def _min_valor_nodo(self, nodo):
-        actual = nodo
-        while actual.izq is not None:
-            actual = actual.izq
-        return actual
+        # Caso 1: Cero o un hijo
+        hijo = nodo.izq if nodo.izq is not None else nodo.der
+        if not camino:
+            self.raiz = hijo
+        elif camino[-1].izq is nodo:
+            camino[-1].izq = hijo
+        else:
+            camino[-1].der = hijo
+        self._rebalancear_camino(camino)
+        return True
 
     # --- Métodos de Recorrido Adicionales ---
 
     def preorder(self):
-        yield from self._preorder_recursivo(self.raiz)
-
-    def _preorder_recursivo(self, nodo):
-        if nodo is not None:
+        pila = [self.raiz] if self.raiz is not None else []
+        while pila:
+            nodo = pila.pop()
             yield nodo.palabra, nodo.traduccion
-            yield from self._preorder_recursivo(nodo.izq)
-            yield from self._preorder_recursivo(nodo.der)
+            # Se apila primero el derecho para visitar antes el izquierdo
+            if nodo.der is not None:
+                pila.append(nodo.der)
+            if nodo.izq is not None:
+                pila.append(nodo.izq)
 
     def postorder(self):
-        yield from self._postorder_recursivo(self.raiz)
+        pila = []
+        nodo = self.raiz
+        ultimo = None  # último nodo devuelto
+        while pila or nodo is not None:
+            while nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.izq
+            tope = pila[-1]
+            if tope.der is not None and tope.der is not ultimo:
+                # Falta recorrer el sub-árbol derecho
+                nodo = tope.der
+            else:
+                pila.pop()
+                yield tope.palabra, tope.traduccion
+                ultimo = tope
+
+    def recorridos(self):
+        """Recorre el árbol una sola vez y genera los tres recorridos intercalados.
+
+        Devuelve tuplas (tipo, palabra, traduccion) con tipo "pre", "in" o
+        "post": cada nodo se visita al bajar, entre sus dos hijos y al subir.
+        Filtrando por tipo se obtiene exactamente preorder(), inorder() o postorder().
+        """
+        pila = [(self.raiz, 0)] if self.raiz is not None else []
+        while pila:
+            nodo, etapa = pila.pop()
+            if etapa == 0:
+                yield "pre", nodo.palabra, nodo.traduccion
+                pila.append((nodo, 1))
+                if nodo.izq is not None:
+                    pila.append((nodo.izq, 0))
+            elif etapa == 1:
+                yield "in", nodo.palabra, nodo.traduccion
+                pila.append((nodo, 2))
+                if nodo.der is not None:
+                    pila.append((nodo.der, 0))
+            else:
+                yield "post", nodo.palabra, nodo.traduccion
+
+    # --- Operaciones por lotes ---
+    # Con lotes grandes conviene recorrer el árbol una vez, mezclar con el lote
+    # ordenado y reconstruir: O(n + m) en lugar de O(m log n). Con lotes chicos
+    # frente al árbol se sigue insertando/eliminando de a uno.
+
+    def _lote_es_chico(self, m):
+        return m * max(1, _altura(self.raiz)) < len(self)
+
+    def insertar_muchos(self, pares):
+        """Inserta o reemplaza todos los pares de una vez.
+
+        Si una palabra se repite dentro del lote gana la última traducción.
+        Devuelve ``{"agregadas": a, "reemplazadas": r}``.
+        """
+        lote = {}
+        for palabra, traduccion in pares:
+            lote[normalizar(palabra)] = traduccion
+
+        if self._lote_es_chico(len(lote)):
+            reemplazadas = sum(
+                1 for palabra, traduccion in lote.items() if self.insertar_par(palabra, traduccion)
+            )
+            return {"agregadas": len(lote) - reemplazadas, "reemplazadas": reemplazadas}
+
+        # Mezcla de dos secuencias ordenadas: el árbol (in-order) y el lote
+        clave_de = self.intercalacion.clave
+        nuevas = sorted(lote, key=clave_de)
+        claves_nuevas = [clave_de(palabra) for palabra in nuevas]
+        palabras = []
+        traducciones = []
+        claves = []
+        reemplazadas = 0
+        j = 0
+        for nodo in self._nodos_desde(None):
+            palabra, traduccion, clave = nodo.palabra, nodo.traduccion, nodo.clave
+            while j < len(nuevas) and claves_nuevas[j] < clave:
+                palabras.append(nuevas[j])
+                traducciones.append(lote[nuevas[j]])
+                claves.append(claves_nuevas[j])
+                self._indexar(nuevas[j], lote[nuevas[j]])
+                j += 1
+            if j < len(nuevas) and claves_nuevas[j] == clave:
+                self._indexar(palabra, lote[palabra], traduccion)
+                traduccion = lote[palabra]
+                reemplazadas += 1
+                j += 1
+            palabras.append(palabra)
+            traducciones.append(traduccion)
+            claves.append(clave)
+        for palabra, clave in zip(nuevas[j:], claves_nuevas[j:]):
+            palabras.append(palabra)
+            traducciones.append(lote[palabra])
+            claves.append(clave)
+            self._indexar(palabra, lote[palabra])
+
+        self.raiz = self._construir_balanceado(palabras, traducciones, claves, 0, len(palabras))
+        return {"agregadas": len(lote) - reemplazadas, "reemplazadas": reemplazadas}
+
+    def eliminar_muchos(self, palabras):
+        """Elimina todas las palabras de una vez. Devuelve cuántas existían."""
+        borrar = {normalizar(palabra) for palabra in palabras}
+
+        if self._lote_es_chico(len(borrar)):
+            return sum(1 for palabra in borrar if self.eliminar_palabra(palabra))
+
+        quedan = []
+        traducciones = []
+        claves = []
+        eliminadas = 0
+        for nodo in self._nodos_desde(None):
+            if nodo.palabra in borrar:
+                self._desindexar(nodo.palabra, nodo.traduccion)
+                eliminadas += 1
+            else:
+                quedan.append(nodo.palabra)
+                traducciones.append(nodo.traduccion)
+                claves.append(nodo.clave)
+        self.raiz = self._construir_balanceado(quedan, traducciones, claves, 0, len(quedan))
+        return eliminadas
+
+    # --- Consultas ordenadas ---
+    # Todas aprovechan el orden del árbol para descartar sub-árboles completos
+    # en lugar de recorrer todo el in-order.
+
+    def _nodos_desde(self, clave):
+        """Generador de nodos en orden alfabético a partir del primero con clave >= ``clave``.
+
+        Con ``clave=None`` empieza desde el principio.
+        """
+        pila = []
+        nodo = self.raiz
+        while nodo is not None:
+            if clave is not None and nodo.clave < clave:
+                # El nodo y todo su sub-árbol izquierdo quedan antes de 'clave'
+                nodo = nodo.der
+            else:
+                pila.append(nodo)
+                nodo = nodo.izq
+        while pila:
+            nodo = pila.pop()
+            yield nodo
+            nodo = nodo.der
+            while nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.izq
+
+    def rango(self, desde=None, hasta=None):
+        """Generador de pares (palabra, traduccion) con desde <= palabra <= hasta."""
+        desde = self._clave(desde)[1] if desde is not None else None
+        hasta = self._clave(hasta)[1] if hasta is not None else None
+        for nodo in self._nodos_desde(desde):
+            if hasta is not None and nodo.clave > hasta:
+                return
+            yield nodo.palabra, nodo.traduccion
+
+    def prefijo(self, p, limite=None):
+        """Devuelve hasta ``limite`` pares cuya palabra empieza con ``p`` (autocompletado).
+
+        El prefijo se compara con la parte primaria de la intercalación: con el
+        orden "espanol", "cancion" también encuentra "canción".
+        """
+        p = self.intercalacion.primaria(normalizar(p))
+        resultado = []
+        # Las claves que empiezan con la parte primaria buscada están todas seguidas
+        for nodo in self._nodos_desde(p):
+            if not nodo.clave.startswith(p):
+                break
+            if limite is not None and len(resultado) >= limite:
+                break
+            resultado.append((nodo.palabra, nodo.traduccion))
+        return resultado
+
+    def floor(self, palabra):
+        """Devuelve el par con la mayor palabra <= ``palabra``, o None."""
+        clave = self._clave(palabra)[1]
+        mejor = None
+        nodo = self.raiz
+        while nodo is not None:
+            if clave == nodo.clave:
+                return nodo.palabra, nodo.traduccion
+            if clave < nodo.clave:
+                nodo = nodo.izq
+            else:
+                mejor = nodo
+                nodo = nodo.der
+        return (mejor.palabra, mejor.traduccion) if mejor is not None else None
+
+    def ceiling(self, palabra):
+        """Devuelve el par con la menor palabra >= ``palabra``, o None."""
+        clave = self._clave(palabra)[1]
+        mejor = None
+        nodo = self.raiz
+        while nodo is not None:
+            if clave == nodo.clave:
+                return nodo.palabra, nodo.traduccion
+            if clave > nodo.clave:
+                nodo = nodo.der
+            else:
+                mejor = nodo
+                nodo = nodo.izq
+        return (mejor.palabra, mejor.traduccion) if mejor is not None else None
+
+    def inorder_desde(self, i):
+        """Generador in-order que empieza en la posición ``i`` (desde 0).
+
+        Baja una sola vez desde la raíz usando los tamaños de los sub-árboles,
+        así que llegar a la posición cuesta O(log n) en lugar de saltar i pares.
+        """
+        pila = []
+        nodo = self.raiz
+        while nodo is not None:
+            izq = _tam(nodo.izq)
+            if i <= izq:
+                # La posición buscada está en este nodo o a su izquierda
+                pila.append(nodo)
+                if i == izq:
+                    break
+                nodo = nodo.izq
+            else:
+                i -= izq + 1
+                nodo = nodo.der
+        while pila:
+            nodo = pila.pop()
+            yield nodo.palabra, nodo.traduccion
+            nodo = nodo.der
+            while nodo is not None:
+                pila.append(nodo)
+                nodo = nodo.izq
+
+    def cursor(self, palabra=None):
+        """Devuelve un ``CursorInorder`` ubicado en ``palabra`` (o al principio)."""
+        cursor = CursorInorder(self)
+        if palabra is not None:
+            cursor.seek(palabra)
+        return cursor
+
+    def k_esimo(self, k):
+        """Devuelve el par que ocupa la posición ``k`` (desde 0) en orden alfabético."""
+        if not 0 <= k < len(self):
+            raise IndexError(f"Posición {k} fuera del diccionario")
+        nodo = self.raiz
+        while True:
+            izq = _tam(nodo.izq)
+            if k < izq:
+                nodo = nodo.izq
+            elif k == izq:
+                return nodo.palabra, nodo.traduccion
+            else:
+                k -= izq + 1
+                nodo = nodo.der
+
+    def posicion(self, palabra):
+        """Devuelve cuántas palabras del diccionario son menores que ``palabra`` (rank)."""
+        clave = self._clave(palabra)[1]
+        pos = 0
+        nodo = self.raiz
+        while nodo is not None:
+            if clave <= nodo.clave:
+                nodo = nodo.izq
+            else:
+                pos += _tam(nodo.izq) + 1
+                nodo = nodo.der
+        return pos
+
+    # --- Estadísticas ---
+
+    def estadisticas(self):
+        """Devuelve un diccionario con datos de forma del árbol.
+
+        Sirve para comprobar que el árbol realmente está balanceado:
+        ``altura`` debería quedar cerca de ``altura_minima``.
+        """
+        nodos = 0
+        hojas = 0
+        desbalance_max = 0
+        pendientes = [self.raiz] if self.raiz is not None else []
+        while pendientes:
+            nodo = pendientes.pop()
+            nodos += 1
+            if nodo.izq is None and nodo.der is None:
+                hojas += 1
+            desbalance_max = max(desbalance_max, abs(_altura(nodo.izq) - _altura(nodo.der)))
+            if nodo.izq is not None:
+                pendientes.append(nodo.izq)
+            if nodo.der is not None:
+                pendientes.append(nodo.der)
+
+        return {
+            "nodos": nodos,
+            "hojas": hojas,
+            "altura": _altura(self.raiz),
+            # Altura de un árbol perfectamente balanceado con la misma cantidad de nodos
+            "altura_minima": nodos.bit_length(),
+            "desbalance_max": desbalance_max,
+            "balanceado": self.balanceado,
+        }
+
+    def reporte_memoria(self):
+        """Estima cuántos bytes ocupa el diccionario (nodos más cadenas).
+
+        Cada cadena se cuenta una sola vez aunque la compartan varios nodos.
+        """
+        nodos = 0
+        bytes_nodos = 0
+        bytes_cadenas = 0
+        vistas = set()
+        pendientes = [self.raiz] if self.raiz is not None else []
+        while pendientes:
+            nodo = pendientes.pop()
+            nodos += 1
+            bytes_nodos += sys.getsizeof(nodo)
+            for cadena in (nodo.palabra, nodo.traduccion, nodo.clave):
+                if id(cadena) not in vistas:
+                    vistas.add(id(cadena))
+                    bytes_cadenas += sys.getsizeof(cadena)
+            if nodo.izq is not None:
+                pendientes.append(nodo.izq)
+            if nodo.der is not None:
+                pendientes.append(nodo.der)
+
+        total = bytes_nodos + bytes_cadenas
+        return {
+            "nodos": nodos,
+            "bytes_nodos": bytes_nodos,
+            "bytes_cadenas": bytes_cadenas,
+            "bytes_total": total,
+            "bytes_por_entrada": total / nodos if nodos else 0,
+        }
+
+
+class DiccionarioPersistente(DiccionarioBST):
+    """Variante persistente de ``DiccionarioBST``: los nodos nunca se modifican.
+
+    Cada inserción o eliminación copia sólo los nodos del camino desde la raíz
+    (y los que toque una rotación) y deja ``raiz`` apuntando a la raíz nueva;
+    el resto de los sub-árboles se comparte con las versiones anteriores. Así
+    ``copiar()`` es O(1): la copia se queda con la raíz actual y ninguna edición
+    posterior la altera, de modo que otros hilos pueden leerla sin bloquear a
+    quien edita.
+
+    Las copias no llevan los índices hash, inverso ni difuso, que sí son
+    mutables; sus búsquedas van por el árbol en O(log n) y ``buscar_inversa``
+    y ``sugerencias`` lo recorren entero.
+    """
+
+    def copiar(self):
+        """Devuelve una vista fija del diccionario en O(1), compartiendo los nodos."""
+        copia = type(self)(balanceado=self.balanceado, intercalacion=self.intercalacion)
+        copia.raiz = self.raiz
+        return copia
+
+    @staticmethod
+    def _enlazar(padre, original, copia):
+        """Reemplaza en ``padre`` (ya copiado) el hijo ``original`` por ``copia``."""
+        if padre.izq is original:
+            padre.izq = copia
+        else:
+            padre.der = copia
+
+    def insertar_par(self, palabra, traduccion):
+        palabra, clave = self._clave(palabra)
+        if self.raiz is None:
+            self.raiz = Nodo(palabra, traduccion, clave)
+            self._indexar(palabra, traduccion)
+            return False
+
+        # El camino se arma con copias de los nodos; los originales no se tocan
+        camino = []
+        nodo = self.raiz
+        while nodo is not None:
+            copia = _clonar_nodo(nodo)
+            if camino:
+                self._enlazar(camino[-1], nodo, copia)
+            camino.append(copia)
+            if clave == nodo.clave:
+                copia.traduccion = traduccion
+                self.raiz = camino[0]
+                self._indexar(palabra, traduccion, nodo.traduccion)
+                return True
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
+
+        padre = camino[-1]
+        if clave < padre.clave:
+            padre.izq = Nodo(palabra, traduccion, clave)
+        else:
+            padre.der = Nodo(palabra, traduccion, clave)
+        self.raiz = camino[0]
+        self._rebalancear_camino(camino)
+        self._indexar(palabra, traduccion)
+        return False
+
+    def eliminar_palabra(self, palabra):
+        palabra, clave = self._clave(palabra)
+        if self._indice is not None and palabra not in self._indice:
+            return False
+        # Primero se busca sin copiar nada, por si la palabra no existe
+        encontrado = self._buscar_nodo(clave)
+        if encontrado is None:
+            return False
+        self._desindexar(palabra, encontrado.traduccion)
+
+        camino = []
+        nodo = self.raiz
+        while clave != nodo.clave:
+            copia = _clonar_nodo(nodo)
+            if camino:
+                self._enlazar(camino[-1], nodo, copia)
+            camino.append(copia)
+            nodo = nodo.izq if clave < nodo.clave else nodo.der
+
+        if nodo.izq is not None and nodo.der is not None:
+            # Dos hijos: la copia del nodo recibe los datos del sucesor in-order
+            # y se quita el sucesor, copiando el camino hasta él
+            copia = _clonar_nodo(nodo)
+            if camino:
+                self._enlazar(camino[-1], nodo, copia)
+            camino.append(copia)
+            sucesor = nodo.der
+            while sucesor.izq is not None:
+                siguiente = _clonar_nodo(sucesor)
+                self._enlazar(camino[-1], sucesor, siguiente)
+                camino.append(siguiente)
+                sucesor = sucesor.izq
+            copia.palabra = sucesor.palabra
+            copia.traduccion = sucesor.traduccion
+            copia.clave = sucesor.clave
+            nodo = sucesor
+
+        hijo = nodo.izq if nodo.izq is not None else nodo.der
+        if not camino:
+            self.raiz = hijo
+            return True
+        self._enlazar(camino[-1], nodo, hijo)
+        self.raiz = camino[0]
+        self._rebalancear_camino(camino)
+        return True
+
+    # Al eliminar, una rotación puede caer en el sub-árbol hermano, que sigue
+    # compartido: se copian los nodos que la rotación modifica.
+
+    def _rotar_derecha(self, nodo):
+        nodo = _clonar_nodo(nodo)
+        nodo.izq = _clonar_nodo(nodo.izq)
+        return super()._rotar_derecha(nodo)
+
+    def _rotar_izquierda(self, nodo):
+        nodo = _clonar_nodo(nodo)
+        nodo.der = _clonar_nodo(nodo.der)
+        return super()._rotar_izquierda(nodo)
+
+
+class CursorInorder:
+    """Cursor para paginar el recorrido in-order desde cualquier posición.
+
+    La posición va de 0 a ``len(bst)`` y queda entre dos pares: ``next(k)``
+    devuelve los k pares siguientes y avanza; ``prev(k)`` devuelve los k
+    anteriores (en orden alfabético) y retrocede. Cada llamada cuesta
+    O(log n + k), sin importar en qué página esté el cursor.
+
+    Sirve para cualquier diccionario que tenga ``posicion``, ``inorder_desde``
+    y ``len``, y tolera que el árbol cambie entre una llamada y otra.
+    """
+    def __init__(self, bst):
+        self.bst = bst
+        self.posicion = 0
+
+    def seek(self, palabra):
+        """Se ubica justo antes de la primera palabra >= ``palabra``."""
+        self.posicion = self.bst.posicion(palabra)
+        return self.posicion
+
+    def seek_rank(self, i):
+        """Se ubica en la posición ``i`` (se ajusta al rango válido)."""
+        self.posicion = max(0, min(i, len(self.bst)))
+        return self.posicion
+
+    def next(self, k=1):
+        pares = list(islice(self.bst.inorder_desde(self.posicion), k))
+        self.posicion += len(pares)
+        return pares
 
-    def _postorder_recursivo(self, nodo):
-        if nodo is not None:
-            yield from self._postorder_recursivo(nodo.izq)
-            yield from self._postorder_recursivo(nodo.der)
-            yield nodo.palabra, nodo.traduccion
\ No newline at end of file
+    def prev(self, k=1):
+        inicio = max(0, min(self.posicion, len(self.bst)) - k)
+        pares = list(islice(self.bst.inorder_desde(inicio), self.posicion - inicio))
+        self.posicion = inicio
+        return pares
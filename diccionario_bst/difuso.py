@@ -0,0 +1,144 @@
+# difuso.py
+
+import heapq
+
+# Sólo se indexan los borrados de las primeras letras; el resto de la palabra
+# se compara al verificar cada candidata
+LARGO_PREFIJO = 7
+# Distancia máxima de las sugerencias, con y sin índice. El índice garantiza
+# encontrar todas las palabras hasta la distancia de los borrados que guarda,
+# así que buscar más lejos que eso daría resultados incompletos (y distintos
+# de comparar contra todas). Con 1 se guardan 8 variantes por palabra; con 2
+# serían 29.
+DISTANCIA_MAX = 1
+
+
+def distancia(a, b, tope=None):
+    """Distancia de edición entre ``a`` y ``b`` (inserción, borrado, sustitución
+    y transposición de dos letras vecinas).
+
+    Si se da ``tope`` y la distancia lo supera, deja de calcular y devuelve
+    ``tope + 1``: para descartar candidatas no hace falta el valor exacto.
+    """
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if tope is not None and len(a) - len(b) > tope:
+        return tope + 1
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        actual = [i]
+        for j, cb in enumerate(b, 1):
+            valor = min(anterior[j] + 1, actual[j - 1] + 1, anterior[j - 1] + (ca != cb))
+            if (anterior2 is not None and j > 1 and ca == b[j - 2]
+                    and a[i - 2] == cb and ca != cb):
+                valor = min(valor, anterior2[j - 2] + 1)
+            actual.append(valor)
+        if tope is not None and min(actual) > tope:
+            return tope + 1
+        anterior2, anterior = anterior, actual
+    return anterior[-1]
+
+
+def mas_parecidas(palabra, candidatas, limite=5, distancia_max=DISTANCIA_MAX):
+    """Las ``limite`` candidatas más cercanas a ``palabra`` (a distancia <= distancia_max).
+
+    Se ordenan por distancia, después por diferencia de largo y por último
+    alfabéticamente.
+    """
+    puntajes = []
+    for candidata in candidatas:
+        d = distancia(palabra, candidata, distancia_max)
+        if d <= distancia_max:
+            puntajes.append((d, abs(len(candidata) - len(palabra)), candidata))
+    return [candidata for _, _, candidata in heapq.nsmallest(limite, puntajes)]
+
+
+class IndiceDifuso:
+    """Índice de borrados (al estilo SymSpell) para sugerir palabras parecidas.
+
+    Por cada palabra se guardan las variantes de su prefijo que resultan de
+    borrar hasta ``distancia_max`` letras. Dos palabras a una edición de
+    distancia comparten alguna variante, así que para una búsqueda alcanza con
+    generar las variantes de lo escrito, juntar las palabras que tienen alguna
+    de ellas y verificar sólo esas con ``distancia``. Buscar cuesta unos pocos
+    accesos a un ``dict`` en lugar de comparar contra todo el diccionario.
+
+    Agregar o quitar una palabra actualiza sólo sus variantes, así que el
+    índice se mantiene junto con el árbol sin reconstruirlo.
+    """
+    def __init__(self, palabras=(), distancia_max=DISTANCIA_MAX, largo_prefijo=LARGO_PREFIJO):
+        self.distancia_max = distancia_max
+        self.largo_prefijo = largo_prefijo
+        # variante -> palabra, o lista de palabras si la comparten varias
+        # (la mayoría de las variantes son de una sola palabra y así ocupan menos)
+        self._variantes = {}
+        self._cantidad = 0
+        for palabra in palabras:
+            self.agregar(palabra)
+
+    def __len__(self):
+        return self._cantidad
+
+    def _claves(self, palabra):
+        prefijo = palabra[:self.largo_prefijo]
+        claves = {prefijo}
+        borde = [prefijo]
+        for _ in range(self.distancia_max):
+            siguiente = []
+            for variante in borde:
+                for i in range(len(variante)):
+                    nueva = variante[:i] + variante[i + 1:]
+                    if nueva not in claves:
+                        claves.add(nueva)
+                        siguiente.append(nueva)
+            borde = siguiente
+        return claves
+
+    def agregar(self, palabra):
+        """Agrega una palabra que no estaba en el índice."""
+        variantes = self._variantes
+        for clave in self._claves(palabra):
+            actual = variantes.get(clave)
+            if actual is None:
+                variantes[clave] = palabra
+            elif type(actual) is str:
+                variantes[clave] = [actual, palabra]
+            else:
+                actual.append(palabra)
+        self._cantidad += 1
+
+    def quitar(self, palabra):
+        variantes = self._variantes
+        for clave in self._claves(palabra):
+            actual = variantes.get(clave)
+            if actual is None:
+                continue
+            if type(actual) is str:
+                if actual == palabra:
+                    del variantes[clave]
+            elif palabra in actual:
+                actual.remove(palabra)
+                if len(actual) == 1:
+                    variantes[clave] = actual[0]
+        self._cantidad -= 1
+
+    def sugerencias(self, palabra, limite=5):
+        """Hasta ``limite`` palabras del índice parecidas a ``palabra``, de la más cercana a la más lejana.
+
+        Sólo se devuelven palabras hasta ``distancia_max``: son las que el
+        índice garantiza encontrar.
+        """
+        palabra = palabra.lower()
+        candidatas = set()
+        for clave in self._claves(palabra):
+            actual = self._variantes.get(clave)
+            if actual is None:
+                continue
+            if type(actual) is str:
+                candidatas.add(actual)
+            else:
+                candidatas.update(actual)
+        return mas_parecidas(palabra, candidatas, limite, self.distancia_max)
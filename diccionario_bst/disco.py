@@ -0,0 +1,253 @@
+# disco.py
+
+import mmap
+
+from bst import CursorInorder, separar_traducciones
+from difuso import mas_parecidas
+from intercalacion import CODIGO, normalizar, intercalacion_por_codigo
+from functions import (
+    MAGIA_BINARIO, VERSION_BINARIO, _CABECERA, _LARGO, _DESPLAZAMIENTO
+)
+
+
+class DiccionarioDisco:
+    """Diccionario de sólo lectura servido directamente desde un snapshot binario.
+
+    En lugar de reconstruir el árbol en memoria, mapea el archivo escrito por
+    ``exportar_binario`` (versión 2, con índice de desplazamientos) y responde
+    las consultas con búsqueda binaria sobre los registros ordenados. La
+    memoria usada no depende del tamaño del diccionario: el sistema operativo
+    sólo trae a RAM las páginas que se van leyendo.
+
+    Ofrece la misma interfaz de lectura que ``DiccionarioBST`` (búsqueda,
+    recorridos y consultas por rango), así que sirve para las funciones de
+    exportación de ``functions.py``.
+    """
+    def __init__(self, ruta_archivo):
+        self._archivo = open(ruta_archivo, 'rb')
+        try:
+            self._mm = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap no acepta archivos vacíos
+            self._archivo.close()
+            raise ValueError("snapshot incompleto")
+
+        if len(self._mm) < _CABECERA.size + _LARGO.size:
+            self.cerrar()
+            raise ValueError("snapshot incompleto")
+        magia, version, codigo, cantidad = _CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA_BINARIO or version != VERSION_BINARIO:
+            self.cerrar()
+            raise ValueError("el archivo no es un snapshot con índice (versión 2)")
+        try:
+            self.intercalacion = intercalacion_por_codigo(codigo)
+        except ValueError:
+            self.cerrar()
+            raise
+        # Con el orden por código se comparan los bytes UTF-8 sin decodificar:
+        # ese orden coincide con el de las cadenas de Python
+        self._por_bytes = self.intercalacion is CODIGO
+        self._n = cantidad
+        self._inicio_indice = len(self._mm) - _LARGO.size - _DESPLAZAMIENTO.size * cantidad
+
+    def cerrar(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._archivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def __len__(self):
+        return self._n
+
+    def __contains__(self, palabra):
+        return self.buscar_traduccion(palabra) is not None
+
+    # --- Acceso a los registros ---
+
+    def _desplazamiento(self, i):
+        return _DESPLAZAMIENTO.unpack_from(self._mm, self._inicio_indice + i * _DESPLAZAMIENTO.size)[0]
+
+    def _clave(self, i):
+        """Clave de orden del registro i.
+
+        Con el orden por código son directamente los bytes UTF-8 de la palabra;
+        con otra intercalación se decodifica y se calcula su clave.
+        """
+        pos = self._desplazamiento(i)
+        (largo,) = _LARGO.unpack_from(self._mm, pos)
+        pos += _LARGO.size
+        if self._por_bytes:
+            return self._mm[pos:pos + largo]
+        return self.intercalacion.clave(self._mm[pos:pos + largo].decode('utf-8'))
+
+    def _clave_consulta(self, palabra):
+        """Clave comparable con ``_clave`` para una palabra todavía sin normalizar."""
+        clave = self.intercalacion.clave(normalizar(palabra))
+        return clave.encode('utf-8') if self._por_bytes else clave
+
+    def _par(self, i):
+        pos = self._desplazamiento(i)
+        (largo,) = _LARGO.unpack_from(self._mm, pos)
+        pos += _LARGO.size
+        palabra = self._mm[pos:pos + largo].decode('utf-8')
+        pos += largo
+        (largo,) = _LARGO.unpack_from(self._mm, pos)
+        pos += _LARGO.size
+        return palabra, self._mm[pos:pos + largo].decode('utf-8')
+
+    def _primero_mayor_igual(self, clave):
+        """Búsqueda binaria: índice del primer registro con clave >= ``clave``."""
+        bajo, alto = 0, self._n
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._clave(medio) < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    # --- Consultas ---
+
+    def buscar_traduccion(self, palabra):
+        clave = self._clave_consulta(palabra)
+        i = self._primero_mayor_igual(clave)
+        if i < self._n and self._clave(i) == clave:
+            return self._par(i)[1]
+        return None
+
+    def traducciones(self, palabra):
+        traduccion = self.buscar_traduccion(palabra)
+        return separar_traducciones(traduccion) if traduccion is not None else []
+
+    def buscar_inversa(self, traduccion):
+        """Palabras que tienen ``traduccion``. El snapshot no guarda índice inverso: recorre todo."""
+        traduccion = traduccion.strip().lower()
+        return [
+            palabra for palabra, traducciones in self.inorder()
+            if traduccion in (parte.lower() for parte in separar_traducciones(traducciones))
+        ]
+
+    def sugerencias(self, palabra, limite=5):
+        """Palabras parecidas a ``palabra``; sin índice difuso compara contra todas."""
+        return mas_parecidas(normalizar(palabra), (palabra for palabra, _ in self.inorder()), limite)
+
+    def posicion(self, palabra):
+        return self._primero_mayor_igual(self._clave_consulta(palabra))
+
+    def inorder_desde(self, i):
+        for j in range(max(i, 0), self._n):
+            yield self._par(j)
+
+    def cursor(self, palabra=None):
+        cursor = CursorInorder(self)
+        if palabra is not None:
+            cursor.seek(palabra)
+        return cursor
+
+    def k_esimo(self, k):
+        if not 0 <= k < self._n:
+            raise IndexError(f"Posición {k} fuera del diccionario")
+        return self._par(k)
+
+    def floor(self, palabra):
+        clave = self._clave_consulta(palabra)
+        i = self._primero_mayor_igual(clave)
+        if i < self._n and self._clave(i) == clave:
+            return self._par(i)
+        return self._par(i - 1) if i > 0 else None
+
+    def ceiling(self, palabra):
+        i = self.posicion(palabra)
+        return self._par(i) if i < self._n else None
+
+    def rango(self, desde=None, hasta=None):
+        i = self.posicion(desde) if desde is not None else 0
+        hasta = self._clave_consulta(hasta) if hasta is not None else None
+        while i < self._n:
+            if hasta is not None and self._clave(i) > hasta:
+                return
+            yield self._par(i)
+            i += 1
+
+    def prefijo(self, p, limite=None):
+        # Igual que en DiccionarioBST, el prefijo se compara con la parte primaria
+        p = self.intercalacion.primaria(normalizar(p))
+        if self._por_bytes:
+            p = p.encode('utf-8')
+        resultado = []
+        i = self._primero_mayor_igual(p)
+        while i < self._n and (limite is None or len(resultado) < limite):
+            if not self._clave(i).startswith(p):
+                break
+            resultado.append(self._par(i))
+            i += 1
+        return resultado
+
+    # --- Recorridos ---
+    # Los registros ordenados se ven como el árbol perfectamente balanceado que
+    # armaría DiccionarioBST.from_pairs: la raíz de [inicio, fin) es el del medio.
+
+    def inorder(self):
+        for i in range(self._n):
+            yield self._par(i)
+
+    def preorder(self):
+        pila = [(0, self._n)]
+        while pila:
+            inicio, fin = pila.pop()
+            if inicio >= fin:
+                continue
+            medio = (inicio + fin) // 2
+            yield self._par(medio)
+            pila.append((medio + 1, fin))
+            pila.append((inicio, medio))
+
+    def postorder(self):
+        # Cada rango se apila dos veces: la segunda vez (visitado=True) ya se
+        # recorrieron sus dos mitades y toca devolver su raíz
+        pila = [(0, self._n, False)]
+        while pila:
+            inicio, fin, visitado = pila.pop()
+            if inicio >= fin:
+                continue
+            medio = (inicio + fin) // 2
+            if visitado:
+                yield self._par(medio)
+            else:
+                pila.append((inicio, fin, True))
+                pila.append((medio + 1, fin, False))
+                pila.append((inicio, medio, False))
+
+    def recorridos(self):
+        """Los tres recorridos en una sola pasada, igual que ``DiccionarioBST.recorridos``."""
+        pila = [(0, self._n, 0)]
+        while pila:
+            inicio, fin, etapa = pila.pop()
+            if inicio >= fin:
+                continue
+            medio = (inicio + fin) // 2
+            palabra, traduccion = self._par(medio)
+            if etapa == 0:
+                yield "pre", palabra, traduccion
+                pila.append((inicio, fin, 1))
+                pila.append((inicio, medio, 0))
+            elif etapa == 1:
+                yield "in", palabra, traduccion
+                pila.append((inicio, fin, 2))
+                pila.append((medio + 1, fin, 0))
+            else:
+                yield "post", palabra, traduccion
+
+    # --- Modificación (no permitida) ---
+
+    def insertar_par(self, palabra, traduccion):
+        raise TypeError("DiccionarioDisco es de sólo lectura")
+
+    def eliminar_palabra(self, palabra):
+        raise TypeError("DiccionarioDisco es de sólo lectura")
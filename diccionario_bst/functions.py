@@ -1,56 +1,542 @@
 import os
+import io
+import sys
+import gzip
+import heapq
+import multiprocessing
+import shutil
+import tempfile
+import mmap
+import struct
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 # Importamos la clase DiccionarioBST desde el archivo bst
 from bst import DiccionarioBST 
+from intercalacion import normalizar, obtener_intercalacion, intercalacion_por_codigo
 
-def cargar_diccionario(ruta_archivo):
-    """Carga los pares palabra-traducción de un archivo y los inserta en un BST."""
-    bst = DiccionarioBST()
+# Formato binario (snapshot):
+#   cabecera  = MAGIA (4 bytes) + versión (u16) + intercalación (u16) + cantidad (u64)
+#   registros = por cada palabra, en el orden de la intercalación (ver
+#               intercalacion.py; 0 = por código): largo (u32) + palabra UTF-8,
+#               largo (u32) + traducción UTF-8
+#   índice    = (desde la versión 2) desplazamiento (u64) de cada registro, para
+#               poder leer el registro i sin recorrer los anteriores
+#   cola      = CRC32 (u32) de todo lo anterior
+# Todos los enteros son little-endian.
+MAGIA_BINARIO = b"DBST"
+VERSION_BINARIO = 2
+_CABECERA = struct.Struct("<4sHHQ")
+_LARGO = struct.Struct("<I")
+_DESPLAZAMIENTO = struct.Struct("<Q")
+
+# Tamaño de cada lectura del archivo y cantidad de pares que se entregan juntos
+TAM_BLOQUE = 1 << 20  # 1 MiB
+TAM_LOTE = 10000
+
+
+def _parsear_linea(linea):
+    """Devuelve (palabra, traduccion) si la línea tiene el formato 'palabra:traduccion', si no None."""
+    partes = linea.strip().split(':', 1)
+    if len(partes) == 2:
+        palabra = partes[0].strip()
+        traduccion = partes[1].strip()
+        if palabra and traduccion:
+            return palabra, traduccion
+    return None
+
+
+def _decodificar_lineas(datos):
+    """Parte ``datos`` en líneas de texto; las que no son UTF-8 válido quedan como None."""
+    try:
+        return datos.decode('utf-8').split("\n")
+    except UnicodeDecodeError:
+        # Sólo si el bloque tiene algún error se decodifica línea por línea
+        lineas = []
+        for linea in datos.split(b"\n"):
+            try:
+                lineas.append(linea.decode('utf-8'))
+            except UnicodeDecodeError:
+                lineas.append(None)
+        return lineas
+
+
+def leer_lotes(ruta_archivo, errores=None, al_progreso=None,
+               tam_bloque=TAM_BLOQUE, tam_lote=TAM_LOTE):
+    """Generador que lee el archivo por bloques grandes y entrega listas de pares.
+
+    - ``errores``: si se pasa una lista, se le agregan los números de línea
+      (desde 1) que no tienen el formato 'palabra:traduccion' o que no son
+      UTF-8 válido. Las líneas en blanco se ignoran sin reportarse.
+    - ``al_progreso(bytes_leidos, bytes_totales)``: se llama después de cada bloque.
+
+    Como no bloquea nada de la GUI, se puede usar desde un hilo de trabajo e ir
+    insertando cada lote a medida que llega.
+    """
+    total = os.path.getsize(ruta_archivo)
+    leidos = 0
+    numero_linea = 0
+    lote = []
+    resto = b""
+
+    def procesar(datos):
+        nonlocal numero_linea
+        for linea in _decodificar_lineas(datos):
+            numero_linea += 1
+            par = _parsear_linea(linea) if linea is not None else None
+            if par is not None:
+                lote.append(par)
+            elif errores is not None and (linea is None or linea.strip()):
+                errores.append(numero_linea)
+
+    with open(ruta_archivo, 'rb') as f:
+        while True:
+            bloque = f.read(tam_bloque)
+            if not bloque:
+                break
+            leidos += len(bloque)
+            datos = resto + bloque
+            # Sólo se decodifica hasta el último salto de línea completo; como
+            # '\n' nunca forma parte de un carácter UTF-8 multibyte, el corte es seguro.
+            corte = datos.rfind(b"\n")
+            if corte == -1:
+                resto = datos
+            else:
+                resto = datos[corte + 1:]
+                procesar(datos[:corte])
+
+            if len(lote) >= tam_lote:
+                yield lote
+                lote = []
+            if al_progreso is not None:
+                al_progreso(leidos, total)
+
+    if resto:
+        procesar(resto)
+    if lote:
+        yield lote
+
+
+def cargar_diccionario(ruta_archivo, balanceado=True, indice_hash=False, errores=None,
+                       indice_inverso=False, indice_difuso=False, intercalacion="codigo",
+                       al_progreso=None, clase=DiccionarioBST):
+    """Carga los pares palabra-traducción de un archivo en un BST.
+
+    El árbol se arma de una sola vez con ``DiccionarioBST.from_pairs``, que
+    ordena los pares y construye un árbol balanceado en lugar de insertar
+    línea por línea. Por defecto el árbol resultante es AVL; con
+    ``indice_hash=True`` también lleva el índice para búsquedas exactas en O(1)
+    y con ``indice_inverso=True`` el de traducción -> palabras (``indice_difuso``
+    agrega el de sugerencias). Si se pasa la lista ``errores`` se llena con las líneas mal formadas.
+    ``al_progreso`` se pasa tal cual a ``leer_lotes``; ``clase`` es la clase
+    del árbol que se devuelve.
+
+    Si el archivo no existe se devuelve un diccionario vacío; cualquier otro
+    error de lectura (``OSError``) llega a quien llama.
+    """
     # Verifica que el archivo exista
     if not os.path.exists(ruta_archivo):
-        return bst
-        
+        return clase(balanceado=balanceado, indice_hash=indice_hash,
+                     indice_inverso=indice_inverso, indice_difuso=indice_difuso,
+                     intercalacion=intercalacion)
+
+    pares = (par for lote in leer_lotes(ruta_archivo, errores, al_progreso) for par in lote)
+    return clase.from_pairs(pares, balanceado=balanceado, indice_hash=indice_hash,
+                            indice_inverso=indice_inverso, indice_difuso=indice_difuso,
+                            intercalacion=intercalacion)
+
+
+# --- Importación de varios archivos en paralelo ---
+
+# Los archivos más grandes que esto se parten en fragmentos para repartirlos
+TAM_FRAGMENTO = 64 << 20  # 64 MiB
+
+
+def _limites_fragmentos(ruta_archivo, tam_fragmento):
+    """Devuelve los desplazamientos [0, ..., tamaño] que parten el archivo en
+    fragmentos de ~tam_fragmento bytes, siempre al comienzo de una línea."""
+    tam = os.path.getsize(ruta_archivo)
+    limites = [0]
+    with open(ruta_archivo, 'rb') as f:
+        pos = tam_fragmento
+        while pos < tam:
+            f.seek(pos)
+            f.readline()  # se avanza hasta el final de la línea cortada
+            pos = f.tell()
+            if pos >= tam:
+                break
+            limites.append(pos)
+            pos += tam_fragmento
+    limites.append(tam)
+    return limites
+
+
+def _parsear_fragmento(ruta_archivo, inicio, fin, intercalacion="codigo"):
+    """Parsea los bytes [inicio, fin) de un archivo (se ejecuta en otro proceso).
+
+    Devuelve (ternas (clave, palabra, traducción) ordenadas por clave y sin
+    repetidos, líneas con error relativas al fragmento, cantidad de líneas
+    del fragmento). La intercalación llega por nombre para poder enviarla al
+    proceso.
+    """
+    with open(ruta_archivo, 'rb') as f:
+        f.seek(inicio)
+        datos = f.read(fin - inicio)
+    lineas = _decodificar_lineas(datos)
+    if lineas and lineas[-1] == "":
+        lineas.pop()
+
+    pares = {}
+    errores = []
+    for numero, linea in enumerate(lineas, start=1):
+        if linea is None:
+            # No es UTF-8 válido
+            errores.append(numero)
+            continue
+        par = _parsear_linea(linea)
+        if par is not None:
+            # Dentro de un mismo fragmento gana la última aparición
+            pares[normalizar(par[0])] = par[1]
+        elif linea.strip():
+            errores.append(numero)
+    clave = obtener_intercalacion(intercalacion).clave
+    ordenados = sorted((clave(palabra), palabra, traduccion) for palabra, traduccion in pares.items())
+    return ordenados, errores, len(lineas)
+
+
+def _etiquetar(ternas, orden, archivo):
+    """Agrega a cada par el orden de su fragmento (para desempatar en la mezcla)
+    y el número de archivo del que viene."""
+    for clave, palabra, traduccion in ternas:
+        yield clave, orden, archivo, palabra, traduccion
+
+
+def _elegir_traduccion(palabra, por_archivo, conflicto):
+    if conflicto == "ultimo":
+        return por_archivo[-1][1]
+    if conflicto == "primero":
+        return por_archivo[0][1]
+    traduccion = por_archivo[0][1]
+    for _, nueva in por_archivo[1:]:
+        traduccion = conflicto(palabra, traduccion, nueva)
+    return traduccion
+
+
+def _resolver_conflictos(mezcla, conflicto):
+    """Agrupa las entradas de la mezcla por palabra y deja una traducción por palabra.
+
+    Dentro de un mismo archivo gana la última aparición, como en
+    ``cargar_diccionario``; la política ``conflicto`` decide entre archivos.
+    """
+    actual = None
+    por_archivo = []  # (archivo, traducción) de la palabra actual, una por archivo
+    for _, _, archivo, palabra, traduccion in mezcla:
+        if palabra != actual:
+            if actual is not None:
+                yield actual, _elegir_traduccion(actual, por_archivo, conflicto)
+            actual = palabra
+            por_archivo = []
+        # Los fragmentos de un archivo son consecutivos en la mezcla
+        if por_archivo and por_archivo[-1][0] == archivo:
+            por_archivo[-1] = (archivo, traduccion)
+        else:
+            por_archivo.append((archivo, traduccion))
+    if actual is not None:
+        yield actual, _elegir_traduccion(actual, por_archivo, conflicto)
+
+
+def importar_archivos(rutas, procesos=None, conflicto="ultimo", balanceado=True,
+                      indice_hash=False, errores=None, al_progreso=None,
+                      tam_fragmento=TAM_FRAGMENTO, indice_inverso=False, indice_difuso=False,
+                      intercalacion="codigo"):
+    """Carga varios archivos 'palabra:traduccion' en un solo DiccionarioBST.
+
+    Cada archivo (o cada fragmento de un archivo grande) se parsea y ordena en
+    un proceso del ``ProcessPoolExecutor``; después las listas ordenadas se
+    mezclan con ``heapq.merge`` y el árbol se arma de una vez con ``from_pairs``.
+
+    - ``conflicto``: qué hacer si una palabra aparece en más de un archivo.
+      ``"ultimo"`` (gana el archivo que aparece después en ``rutas``),
+      ``"primero"``, o una función ``f(palabra, traduccion_anterior, traduccion_nueva)``
+      que devuelve la traducción a guardar.
+    - ``errores``: lista que se llena con (ruta, número de línea) de las líneas
+      mal formadas.
+    - ``al_progreso(fragmentos_listos, fragmentos_totales)``.
+
+    Los procesos se crean con "spawn" y no con "fork": esta función puede
+    llamarse desde un hilo de una aplicación con varios hilos (p. ej. la GUI),
+    y un fork copiaría el proceso con los locks de esos hilos tomados.
+    """
+    if conflicto not in ("ultimo", "primero") and not callable(conflicto):
+        raise ValueError(f"Política de conflicto desconocida: {conflicto!r}")
+
+    nombre_intercalacion = obtener_intercalacion(intercalacion).nombre
+
+    fragmentos = []
+    archivo_de = []
+    for archivo, ruta in enumerate(rutas):
+        limites = _limites_fragmentos(ruta, tam_fragmento)
+        for inicio, fin in zip(limites, limites[1:]):
+            fragmentos.append((ruta, inicio, fin, nombre_intercalacion))
+            archivo_de.append(archivo)
+
+    resultados = [None] * len(fragmentos)
+    if len(fragmentos) <= 1 or procesos == 1:
+        # No vale la pena levantar procesos para un solo fragmento
+        for i, fragmento in enumerate(fragmentos):
+            resultados[i] = _parsear_fragmento(*fragmento)
+            if al_progreso is not None:
+                al_progreso(i + 1, len(fragmentos))
+    else:
+        with ProcessPoolExecutor(max_workers=procesos,
+                                 mp_context=multiprocessing.get_context("spawn")) as ejecutor:
+            futuros = {ejecutor.submit(_parsear_fragmento, *fragmento): i
+                       for i, fragmento in enumerate(fragmentos)}
+            for listos, futuro in enumerate(as_completed(futuros), start=1):
+                resultados[futuros[futuro]] = futuro.result()
+                if al_progreso is not None:
+                    al_progreso(listos, len(fragmentos))
+
+    if errores is not None:
+        # Los números de línea de cada fragmento se pasan a números del archivo
+        lineas_previas = {}
+        for (ruta, _, _, _), (_, errores_fragmento, lineas) in zip(fragmentos, resultados):
+            base = lineas_previas.get(ruta, 0)
+            errores.extend((ruta, base + numero) for numero in errores_fragmento)
+            lineas_previas[ruta] = base + lineas
+
+    corridas = [_etiquetar(pares, orden, archivo_de[orden])
+                for orden, (pares, _, _) in enumerate(resultados)]
+    mezcla = heapq.merge(*corridas)
+    return DiccionarioBST.from_pairs(
+        _resolver_conflictos(mezcla, conflicto), presorted=True,
+        balanceado=balanceado, indice_hash=indice_hash, indice_inverso=indice_inverso,
+        indice_difuso=indice_difuso, intercalacion=intercalacion
+    )
+
+
+# --- Exportación ---
+
+# Los recorridos pre y post se guardan en memoria hasta este tamaño y después en disco
+TAM_SPOOL = 8 << 20  # 8 MiB
+
+
+class OperacionCancelada(Exception):
+    """La lanza el callback ``al_progreso`` para cortar una exportación en curso.
+
+    A diferencia de los demás errores no se atrapa dentro de la exportación:
+    se deja el destino como estaba y la excepción llega a quien la inició.
+    """
+
+
+def _con_progreso(elementos, total, al_progreso):
+    """Devuelve los mismos elementos, llamando a ``al_progreso(hechos, total)`` cada TAM_LOTE."""
+    if al_progreso is None:
+        yield from elementos
+        return
+    hechos = 0
+    for elemento in elementos:
+        yield elemento
+        hechos += 1
+        if hechos % TAM_LOTE == 0:
+            al_progreso(hechos, total)
+    al_progreso(total, total)
+
+
+@contextmanager
+def _escritura_atomica(ruta_archivo, comprimir=False):
+    """Abre un archivo de texto temporal que reemplaza a ``ruta_archivo`` al cerrarse bien.
+
+    Si algo falla a mitad de la escritura el destino queda como estaba, y el
+    temporal se sincroniza a disco antes del reemplazo (como en
+    ``exportar_binario``), así un corte de luz no deja el destino vacío o a
+    medias. Con ``comprimir=True`` el contenido se escribe con gzip.
+    """
+    temporal = ruta_archivo + ".tmp"
     try:
-        with open(ruta_archivo, 'r', encoding='utf-8') as f:
-            for linea in f:
-                # Esperamos formato 'palabra:traduccion'
-                partes = linea.strip().split(':', 1)
-                if len(partes) == 2:
-                    palabra = partes[0].strip()
-                    traduccion = partes[1].strip()
-                    if palabra and traduccion:
-                        bst.insertar_par(palabra, traduccion)
-        return bst
+        if comprimir:
+            binario = io.BufferedWriter(gzip.open(temporal, 'wb'), TAM_BLOQUE)
+        else:
+            binario = open(temporal, 'wb', buffering=TAM_BLOQUE)
+        with io.TextIOWrapper(binario, encoding='utf-8', newline='') as f:
+            yield f
+        # Al cerrarse el wrapper (y el gzip) los datos ya están en el sistema
+        # operativo; el fsync se hace sobre el mismo archivo abierto de nuevo
+        with open(temporal, 'rb') as f:
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta_archivo)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def exportar_inorder(bst, ruta_archivo, comprimir=False, al_progreso=None):
+    """Exporta el diccionario ordenado (InOrder) a un archivo.
+
+    Las líneas se generan a medida que se recorre el árbol y se escriben con
+    un búfer grande, sin armar el archivo completo en memoria. Devuelve True
+    si se pudo exportar.
+    """
+    try:
+        with _escritura_atomica(ruta_archivo, comprimir) as f:
+            pares = _con_progreso(bst.inorder(), len(bst), al_progreso)
+            f.writelines(f"{palabra}:{traduccion}\n" for palabra, traduccion in pares)
+        return True
+    except OperacionCancelada:
+        raise
     except Exception as e:
-        print(f"Error al cargar el diccionario: {e}")
-        return DiccionarioBST()
+        print(f"Error al exportar diccionario: {e}")
+        return False
+
 
+def exportar_binario(bst, ruta_archivo):
+    """Guarda el diccionario en el formato binario (snapshot) descrito arriba.
 
-def exportar_inorder(bst, ruta_archivo):
-    """Exporta el diccionario ordenado (InOrder) a un archivo."""
+    Se escribe primero en un archivo temporal que reemplaza al destino sólo al
+    final, así nunca queda un snapshot a medio escribir. Devuelve True si se
+    pudo guardar.
+    """
+    temporal = ruta_archivo + ".tmp"
     try:
-        with open(ruta_archivo, 'w', encoding='utf-8') as f:
+        with open(temporal, 'wb', buffering=TAM_BLOQUE) as f:
+            cabecera = _CABECERA.pack(MAGIA_BINARIO, VERSION_BINARIO,
+                                      bst.intercalacion.codigo, len(bst))
+            f.write(cabecera)
+            crc = zlib.crc32(cabecera)
+            desplazamientos = array('Q')
+            pos = len(cabecera)
+            partes = []
             for palabra, traduccion in bst.inorder():
-                f.write(f"{palabra}:{traduccion}\n")
+                desplazamientos.append(pos)
+                for texto in (palabra, traduccion):
+                    datos = texto.encode('utf-8')
+                    partes.append(_LARGO.pack(len(datos)))
+                    partes.append(datos)
+                    pos += _LARGO.size + len(datos)
+                # Se escribe en tandas para no hacer un write por registro
+                if len(partes) >= TAM_LOTE:
+                    bloque = b"".join(partes)
+                    crc = zlib.crc32(bloque, crc)
+                    f.write(bloque)
+                    partes = []
+            bloque = b"".join(partes)
+            crc = zlib.crc32(bloque, crc)
+            f.write(bloque)
+
+            if sys.byteorder == 'big':
+                desplazamientos.byteswap()
+            indice = desplazamientos.tobytes()
+            crc = zlib.crc32(indice, crc)
+            f.write(indice)
+            f.write(_LARGO.pack(crc))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta_archivo)
+        return True
     except Exception as e:
-        print(f"Error al exportar diccionario: {e}")
+        print(f"Error al exportar snapshot binario: {e}")
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        return False
+
+
+def cargar_binario(ruta_archivo, balanceado=True, indice_hash=False, indice_inverso=False,
+                   indice_difuso=False, intercalacion="codigo", clase=DiccionarioBST):
+    """Reconstruye un DiccionarioBST desde un snapshot binario.
+
+    El archivo se mapea en memoria y, si los registros ya están ordenados con
+    la misma ``intercalacion``, el árbol se arma directamente con
+    ``from_pairs(presorted=True)``; si no, se reordenan.
+    Lanza ``ValueError`` si el archivo está dañado, para que quien llama
+    pueda volver a cargar desde el texto.
+    ``clase`` permite armar otra variante, p. ej. ``DiccionarioPersistente``.
+    """
+    with open(ruta_archivo, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        vista = memoryview(mm)
+        try:
+            if len(mm) < _CABECERA.size + _LARGO.size:
+                raise ValueError("snapshot incompleto")
+            magia, version, codigo, cantidad = _CABECERA.unpack_from(vista, 0)
+            if magia != MAGIA_BINARIO or version not in (1, VERSION_BINARIO):
+                raise ValueError("el archivo no es un snapshot de diccionario compatible")
+            # Si el snapshot se guardó con otro orden hay que volver a ordenar
+            presorted = intercalacion_por_codigo(codigo) is obtener_intercalacion(intercalacion)
+            fin = len(mm) - _LARGO.size
+            (crc,) = _LARGO.unpack_from(vista, fin)
+            if zlib.crc32(vista[:fin]) != crc:
+                raise ValueError("el checksum del snapshot no coincide")
+            if version >= 2:
+                # El índice de desplazamientos no hace falta para reconstruir el árbol
+                fin -= _DESPLAZAMIENTO.size * cantidad
+
+            palabras = []
+            traducciones = []
+            pos = _CABECERA.size
+            for _ in range(cantidad):
+                (largo,) = _LARGO.unpack_from(vista, pos)
+                pos += 4
+                palabras.append(str(vista[pos:pos + largo], 'utf-8'))
+                pos += largo
+                (largo,) = _LARGO.unpack_from(vista, pos)
+                pos += 4
+                traducciones.append(str(vista[pos:pos + largo], 'utf-8'))
+                pos += largo
+            if pos != fin:
+                raise ValueError("el snapshot tiene datos sobrantes")
+        finally:
+            vista.release()
+
+    return clase.from_pairs(
+        zip(palabras, traducciones), presorted=presorted,
+        balanceado=balanceado, indice_hash=indice_hash, indice_inverso=indice_inverso,
+        indice_difuso=indice_difuso, intercalacion=intercalacion
+    )
+
 
+def exportar_recorridos(bst, ruta_archivo, comprimir=False, al_progreso=None):
+    """Exporta los tres recorridos (InOrder, PreOrder, PostOrder) a un archivo.
 
-def exportar_recorridos(bst, ruta_archivo):
-    """Exporta los tres recorridos (InOrder, PreOrder, PostOrder) a un archivo."""
+    El árbol se recorre una sola vez con ``bst.recorridos()``: el in-order va
+    directo al archivo y el pre-order y post-order a archivos temporales
+    (en memoria mientras son chicos), que al final se copian a continuación.
+    Así la memoria usada no depende del tamaño del diccionario. Devuelve True
+    si se pudo exportar.
+    """
     try:
-        with open(ruta_archivo, 'w', encoding='utf-8') as f:
+        with _escritura_atomica(ruta_archivo, comprimir) as f, \
+                tempfile.SpooledTemporaryFile(TAM_SPOOL, mode='w+', encoding='utf-8') as pre, \
+                tempfile.SpooledTemporaryFile(TAM_SPOOL, mode='w+', encoding='utf-8') as post:
             f.write("=== RECORRIDOS DEL ÁRBOL BST ===\n\n")
 
             # InOrder
             f.write("--- Recorrido IN-ORDER ---\n")
-            f.write(" ".join(palabra for palabra, _ in bst.inorder()) + "\n\n")
+            salidas = {"in": f, "pre": pre, "post": post}
+            # Las palabras van separadas por un espacio: el separador se escribe
+            # antes de cada palabra salvo la primera de cada recorrido
+            separador = {"in": "", "pre": "", "post": ""}
+            visitas = _con_progreso(bst.recorridos(), 3 * len(bst), al_progreso)
+            for tipo, palabra, _ in visitas:
+                salidas[tipo].write(separador[tipo] + palabra)
+                separador[tipo] = " "
+            f.write("\n\n")
 
             # PreOrder
             f.write("--- Recorrido PRE-ORDER ---\n")
-            f.write(" ".join(palabra for palabra, _ in bst.preorder()) + "\n\n")
+            pre.seek(0)
+            shutil.copyfileobj(pre, f, TAM_BLOQUE)
+            f.write("\n\n")
 
             # PostOrder
             f.write("--- Recorrido POST-ORDER ---\n")
-            f.write(" ".join(palabra for palabra, _ in bst.postorder()) + "\n")
+            post.seek(0)
+            shutil.copyfileobj(post, f, TAM_BLOQUE)
+            f.write("\n")
+        return True
+    except OperacionCancelada:
+        raise
     except Exception as e:
         print(f"Error al exportar recorridos: {e}")
+        return False
@@ -0,0 +1,92 @@
+# intercalacion.py
+
+import unicodedata
+
+# Marcas diacríticas combinables (acentos, diéresis, tilde, cedilla...)
+_SIN_MARCAS = dict.fromkeys(range(0x300, 0x370))
+# Después de descomponer (NFD) la ñ queda como una n seguida de la tilde U+0303.
+# Se cambia por "n" + U+007F, que ordena después de "n" con cualquier otra letra
+# y antes de "o": así la ñ queda como una letra propia entre la n y la o.
+_ENIE = "n\u0303"
+_ENIE_CLAVE = "n\x7f"
+# Separa la parte primaria de la palabra completa en las claves que la necesitan
+_SEPARADOR = "\x00"
+
+
+def normalizar(palabra):
+    """Forma con la que se guarda e identifica una palabra: NFC y en minúsculas.
+
+    Se aplica una sola vez por operación, al entrar la palabra al diccionario
+    o al llegar una consulta.
+    """
+    if not palabra.isascii():
+        palabra = unicodedata.normalize("NFC", palabra)
+    return palabra.lower()
+
+
+def _primaria_codigo(palabra):
+    return palabra
+
+
+def _primaria_espanol(palabra):
+    if palabra.isascii():
+        return palabra
+    plegada = unicodedata.normalize("NFD", palabra.casefold())
+    return plegada.replace(_ENIE, _ENIE_CLAVE).translate(_SIN_MARCAS)
+
+
+class Intercalacion:
+    """Regla de orden de las palabras del diccionario.
+
+    ``primaria(palabra)`` da la forma que se compara primero (por ejemplo, sin
+    acentos) y ``clave(palabra)`` la clave completa con la que se ordena el
+    árbol. Ambas reciben palabras ya normalizadas. La clave se calcula una vez
+    por palabra y se guarda en el nodo, así las comparaciones del árbol son
+    comparaciones de cadenas ya armadas.
+
+    Cuando la parte primaria es igual a la palabra la clave es la misma
+    cadena (no ocupa memoria extra); si no, es ``primaria + "\\0" + palabra``,
+    que ordena primero por la parte primaria y desempata por la palabra, así
+    "papa" < "papá" < "papas" y dos palabras distintas nunca tienen la misma
+    clave.
+
+    ``codigo`` identifica la intercalación en la cabecera de los snapshots.
+    """
+    def __init__(self, nombre, codigo, primaria):
+        self.nombre = nombre
+        self.codigo = codigo
+        self.primaria = primaria
+
+    def clave(self, palabra):
+        primaria = self.primaria(palabra)
+        if primaria == palabra:
+            return palabra
+        return primaria + _SEPARADOR + palabra
+
+    def __repr__(self):
+        return f"Intercalacion({self.nombre!r})"
+
+
+# Orden por código Unicode de la palabra en minúsculas (el orden original)
+CODIGO = Intercalacion("codigo", 0, _primaria_codigo)
+# Orden del español: sin distinguir acentos ni mayúsculas, con la ñ entre la n y la o
+ESPANOL = Intercalacion("espanol", 1, _primaria_espanol)
+
+INTERCALACIONES = {intercalacion.nombre: intercalacion for intercalacion in (CODIGO, ESPANOL)}
+
+
+def obtener_intercalacion(intercalacion):
+    """Acepta una ``Intercalacion`` o su nombre ("codigo", "espanol")."""
+    if isinstance(intercalacion, Intercalacion):
+        return intercalacion
+    try:
+        return INTERCALACIONES[intercalacion]
+    except KeyError:
+        raise ValueError(f"Intercalación desconocida: {intercalacion!r}") from None
+
+
+def intercalacion_por_codigo(codigo):
+    for intercalacion in INTERCALACIONES.values():
+        if intercalacion.codigo == codigo:
+            return intercalacion
+    raise ValueError(f"Intercalación desconocida en el snapshot: {codigo}")
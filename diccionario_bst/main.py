@@ -2,24 +2,291 @@
 
 import sys
 import os
+import threading
+from itertools import chain
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QListWidget, QMessageBox, QTabWidget, QGridLayout, QGroupBox
+    QPushButton, QListWidget, QListView, QMessageBox, QTabWidget, QGridLayout,
+    QGroupBox, QProgressBar, QFileDialog
 )
 from PyQt5.QtGui import QFont, QColor, QPalette
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import (
+    Qt, QObject, QRunnable, QThreadPool, pyqtSignal, QAbstractListModel, QModelIndex
+)
 
 # py estén en la misma carpeta
-from functions import cargar_diccionario, exportar_inorder, exportar_recorridos
-# Se importa DiccionarioBST para una inicialización segura
-from bst import DiccionarioBST 
+from functions import (
+    cargar_diccionario, exportar_inorder, exportar_recorridos, cargar_binario, importar_archivos,
+    OperacionCancelada
+)
+# Se importa la variante persistente de DiccionarioBST: sus copias son O(1)
+from bst import DiccionarioPersistente
+from registro import RegistroOperaciones
 
 DATA_PATH = os.path.join("data", "diccionario.txt")
+# Snapshot binario que se guarda al exportar y que se prefiere al arrancar
+SNAPSHOT_PATH = os.path.join("data", "diccionario.dbst")
+# Registro de ediciones posteriores al snapshot; se compacta al superar el límite
+LOG_PATH = os.path.join("data", "diccionario.log")
+LIMITE_REGISTRO = 1000
 OUTPUTS_DIR = "outputs"
+MAX_SUGERENCIAS = 8
+# Orden alfabético del español: sin distinguir acentos y con la ñ después de la n
+INTERCALACION = "espanol"
 # Asegurar que la carpeta 'outputs' exista
 os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
 
+# --- MODELO PARA LA LISTA DEL DICCIONARIO ---
+
+class ModeloDiccionario(QAbstractListModel):
+    """Modelo de Qt que muestra el diccionario sin copiarlo a widgets.
+
+    La vista sólo pide las filas visibles, y éstas se traen del árbol por
+    páginas con un ``CursorInorder``: cada página cuesta O(log n + k) sin
+    importar dónde esté el scroll. Las ediciones individuales avisan
+    sólo la fila afectada (``beginInsertRows``/``beginRemoveRows``), así que
+    agregar o eliminar una palabra no reconstruye la lista completa.
+    """
+    TAM_PAGINA = 200
+
+    def __init__(self, bst, parent=None):
+        super().__init__(parent)
+        self.bst = bst
+        # Página de filas ya leídas del árbol, a partir de la fila _inicio_pagina
+        self._inicio_pagina = 0
+        self._pagina = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.bst)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        fila = index.row()
+        if not self._inicio_pagina <= fila < self._inicio_pagina + len(self._pagina):
+            # La página se centra en la fila pedida para servir scroll en ambos sentidos
+            cursor = self.bst.cursor()
+            self._inicio_pagina = cursor.seek_rank(fila - self.TAM_PAGINA // 2)
+            self._pagina = cursor.next(self.TAM_PAGINA)
+        palabra, traduccion = self._pagina[fila - self._inicio_pagina]
+        return f"{palabra} = {traduccion}"
+
+    def _invalidar_pagina(self):
+        self._pagina = []
+
+    def reiniciar(self, bst):
+        """Cambia de árbol o avisa que cambió mucho de una vez (cargas, registros)."""
+        self.beginResetModel()
+        self.bst = bst
+        self._invalidar_pagina()
+        self.endResetModel()
+
+    def insertar(self, palabra, traduccion):
+        """Inserta o reemplaza a través del modelo. Devuelve True si fue reemplazo."""
+        fila = self.bst.posicion(palabra)
+        if palabra in self.bst:
+            self.bst.insertar_par(palabra, traduccion)
+            self._invalidar_pagina()
+            indice = self.index(fila)
+            self.dataChanged.emit(indice, indice)
+            return True
+        self.beginInsertRows(QModelIndex(), fila, fila)
+        self.bst.insertar_par(palabra, traduccion)
+        self._invalidar_pagina()
+        self.endInsertRows()
+        return False
+
+    def eliminar(self, palabra):
+        """Elimina a través del modelo. Devuelve True si la palabra existía."""
+        if palabra not in self.bst:
+            return False
+        fila = self.bst.posicion(palabra)
+        self.beginRemoveRows(QModelIndex(), fila, fila)
+        self.bst.eliminar_palabra(palabra)
+        self._invalidar_pagina()
+        self.endRemoveRows()
+        return True
+
+
+# --- CARGA EN SEGUNDO PLANO ---
+
+class SenalesCarga(QObject):
+    """Señales que el hilo de carga envía a la GUI (Qt las entrega en el hilo principal)."""
+    # 'object' evita que PyQt intente convertir el árbol a un tipo de Qt
+    arbol = pyqtSignal(object)
+    progreso = pyqtSignal(int)
+    terminado = pyqtSignal(list)
+    error = pyqtSignal(str)
+    cancelado = pyqtSignal()
+
+
+class TrabajoCarga(QRunnable):
+    """Carga el diccionario en un hilo aparte.
+
+    Si hay un snapshot binario se carga sólo de él: el snapshot más el registro
+    de operaciones es el estado del diccionario, con o sin compactación de por
+    medio, y el archivo de texto sólo se lee cuando no hay snapshot (o está
+    dañado). Si el texto se modificó después del snapshot no se mezcla, porque
+    no se puede saber qué palabras le faltan por haberse eliminado desde la
+    GUI; ``texto_ignorado`` queda en True para avisar que hay que importarlo.
+    En todos los casos el árbol (con sus índices) se arma completo en este
+    hilo con ``from_pairs`` y se envía una sola vez, así la GUI sólo tiene que
+    cambiar de árbol.
+    """
+    def __init__(self, ruta_archivo, ruta_snapshot=None):
+        super().__init__()
+        self.ruta_archivo = ruta_archivo
+        self.ruta_snapshot = ruta_snapshot
+        self.texto_ignorado = False
+        self.senales = SenalesCarga()
+
+    def _hay_snapshot(self):
+        return self.ruta_snapshot is not None and os.path.exists(self.ruta_snapshot)
+
+    def _texto_mas_nuevo(self):
+        return (os.path.exists(self.ruta_archivo)
+                and os.path.getmtime(self.ruta_archivo) > os.path.getmtime(self.ruta_snapshot))
+
+    def _cargar_snapshot(self):
+        if not self._hay_snapshot():
+            return None
+        try:
+            return cargar_binario(self.ruta_snapshot, indice_hash=True, indice_inverso=True,
+                                  indice_difuso=True, intercalacion=INTERCALACION,
+                                  clase=DiccionarioPersistente)
+        except (OSError, ValueError) as e:
+            # Snapshot dañado: se sigue con el archivo de texto
+            print(f"No se pudo usar el snapshot binario: {e}")
+            return None
+
+    def run(self):
+        arbol = self._cargar_snapshot()
+        if arbol is not None:
+            self.texto_ignorado = self._texto_mas_nuevo()
+            self.senales.arbol.emit(arbol)
+            self.senales.terminado.emit([])
+            return
+
+        errores = []
+        try:
+            arbol = cargar_diccionario(self.ruta_archivo, indice_hash=True, errores=errores,
+                                       indice_inverso=True, indice_difuso=True,
+                                       intercalacion=INTERCALACION,
+                                       al_progreso=self._avisar_progreso,
+                                       clase=DiccionarioPersistente)
+        except Exception as e:
+            self.senales.error.emit(str(e))
+            return
+        self.senales.progreso.emit(100)
+        self.senales.arbol.emit(arbol)
+        self.senales.terminado.emit(errores)
+
+    def _avisar_progreso(self, leidos, total):
+        # La lectura llega hasta el 90%; el resto es ordenar y armar el árbol
+        self.senales.progreso.emit(int(90 * leidos / total) if total else 90)
+
+
+class TrabajoImportacion(QRunnable):
+    """Importa varios archivos en paralelo (con ``importar_archivos``) fuera de la GUI.
+
+    Recibe una copia del diccionario actual y arma en este hilo el árbol ya
+    mezclado (con sus índices), además de guardar lo importado en el registro;
+    a la GUI sólo le queda reemplazar su árbol por el que se envía en ``arbol``.
+    ``cambios`` queda con las palabras agregadas y reemplazadas.
+    """
+    def __init__(self, rutas, bst, registro):
+        super().__init__()
+        self.rutas = rutas
+        self.bst = bst
+        self.registro = registro
+        self.cambios = None
+        self.senales = SenalesCarga()
+
+    def run(self):
+        errores = []
+        try:
+            importado = importar_archivos(self.rutas, errores=errores, al_progreso=self._avisar_progreso,
+                                          intercalacion=INTERCALACION)
+            pares = list(importado.inorder())
+            # Si una palabra ya estaba, gana la traducción importada
+            arbol = DiccionarioPersistente.from_pairs(
+                chain(self.bst.inorder(), pares), indice_hash=True, indice_inverso=True,
+                indice_difuso=True, intercalacion=INTERCALACION)
+            # Una sola escritura (y un solo fsync) al registro
+            self.registro.registrar_lote(pares)
+        except Exception as e:
+            self.senales.error.emit(str(e))
+            return
+        agregadas = len(arbol) - len(self.bst)
+        self.cambios = {'agregadas': agregadas, 'reemplazadas': len(pares) - agregadas}
+        self.senales.progreso.emit(100)
+        self.senales.arbol.emit(arbol)
+        self.senales.terminado.emit(errores)
+
+    def _avisar_progreso(self, listos, total):
+        # El parseo llega hasta el 90%; el resto es mezclar y armar el árbol
+        self.senales.progreso.emit(int(90 * listos / total))
+
+
+class TrabajoExportacion(QRunnable):
+    """Exporta el diccionario y sus recorridos a texto en un hilo aparte.
+
+    Trabaja sobre una copia del árbol tomada al iniciar, así las ediciones que
+    se hagan mientras tanto no cambian lo que se está escribiendo. Los dos
+    archivos se escriben primero con la extensión ``.nuevo`` y reemplazan a los
+    anteriores recién cuando ambos están completos: ``cancelar()`` corta la
+    exportación en el próximo aviso de progreso y deja los dos como estaban.
+    """
+    def __init__(self, bst, ruta_ordenado, ruta_recorridos):
+        super().__init__()
+        self.bst = bst
+        self.ruta_ordenado = ruta_ordenado
+        self.ruta_recorridos = ruta_recorridos
+        self.senales = SenalesCarga()
+        self._cancelado = threading.Event()
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    def run(self):
+        nuevo_ordenado = self.ruta_ordenado + ".nuevo"
+        nuevo_recorridos = self.ruta_recorridos + ".nuevo"
+        try:
+            # Cada archivo ocupa la mitad de la barra de progreso
+            exito = (exportar_inorder(self.bst, nuevo_ordenado,
+                                      al_progreso=self._avisador(0))
+                     and exportar_recorridos(self.bst, nuevo_recorridos,
+                                             al_progreso=self._avisador(50)))
+            if exito:
+                os.replace(nuevo_ordenado, self.ruta_ordenado)
+                os.replace(nuevo_recorridos, self.ruta_recorridos)
+        except OperacionCancelada:
+            self._borrar_temporales(nuevo_ordenado, nuevo_recorridos)
+            self.senales.cancelado.emit()
+            return
+        except OSError:
+            exito = False
+        if not exito:
+            self._borrar_temporales(nuevo_ordenado, nuevo_recorridos)
+            self.senales.error.emit("no se pudieron escribir los archivos de salida")
+            return
+        self.senales.terminado.emit([])
+
+    @staticmethod
+    def _borrar_temporales(*rutas):
+        for ruta in rutas:
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    def _avisador(self, base):
+        def al_progreso(hechos, total):
+            if self._cancelado.is_set():
+                raise OperacionCancelada()
+            self.senales.progreso.emit(base + (50 * hechos // total if total else 50))
+        return al_progreso
+
+
 class DiccionarioGUI(QWidget):
     def __init__(self):
         super().__init__()
@@ -32,13 +299,21 @@ class DiccionarioGUI(QWidget):
         self.setPalette(palette)
         self.setFont(QFont("Arial", 10))
 
-        # Cargar datos de forma segura
-        loaded_bst = cargar_diccionario(DATA_PATH)
-        # Aseguramos que self.bst sea un objeto válido de DiccionarioBST
-        if isinstance(loaded_bst, DiccionarioBST):
-             self.bst = loaded_bst
-        else:
-             self.bst = DiccionarioBST()
+        # El diccionario empieza vacío y se reemplaza por el que arma el hilo de
+        # carga, así la ventana se abre de inmediato aunque el archivo sea
+        # grande (la lista queda vacía hasta que el árbol está completo)
+        self.bst = DiccionarioPersistente(balanceado=True, indice_hash=True, indice_inverso=True,
+                                          indice_difuso=True, intercalacion=INTERCALACION)
+        # Cada edición se guarda al instante en el registro de operaciones.
+        # No se compacta hasta terminar la carga, para no guardar un árbol a medias.
+        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
+        self.registro = RegistroOperaciones(LOG_PATH)
+        self._compactacion_permitida = False
+        self._exportacion = None
+        self._carga = None
+        # Mientras se importa no se edita ni se compacta: el árbol importado se
+        # arma sobre una copia y reemplaza al actual al terminar
+        self._importacion = None
 
         main_layout = QVBoxLayout()
         
@@ -63,11 +338,88 @@ class DiccionarioGUI(QWidget):
         self._setup_consulta_tab()
         
         main_layout.addWidget(self.tabs)
+
+        # Estado de la carga del archivo
+        self.barra_progreso = QProgressBar()
+        self.barra_progreso.setRange(0, 100)
+        main_layout.addWidget(self.barra_progreso)
+        self.btn_cancelar = QPushButton("Cancelar exportación")
+        self.btn_cancelar.clicked.connect(self.cancelar_exportacion)
+        self.btn_cancelar.hide()
+        main_layout.addWidget(self.btn_cancelar)
+        self.label_estado = QLabel("")
+        self.label_estado.setWordWrap(True)
+        main_layout.addWidget(self.label_estado)
         self.setLayout(main_layout)
 
-        # Llama a actualizar_lista para que se muestre el diccionario
+        self.cargar_en_segundo_plano()
+
+    def cargar_en_segundo_plano(self):
+        if not os.path.exists(DATA_PATH) and not os.path.exists(SNAPSHOT_PATH):
+            self.barra_progreso.hide()
+            self._aplicar_registro()
+            self.label_estado.setText(f"No se encontró '{DATA_PATH}', el diccionario empieza vacío.")
+            return
+        self.label_estado.setText("Cargando diccionario...")
+        trabajo = TrabajoCarga(DATA_PATH, SNAPSHOT_PATH)
+        self._carga = trabajo
+        trabajo.senales.arbol.connect(self._recibir_arbol)
+        trabajo.senales.progreso.connect(self.barra_progreso.setValue)
+        trabajo.senales.terminado.connect(self._carga_terminada)
+        trabajo.senales.error.connect(self._carga_fallida)
+        QThreadPool.globalInstance().start(trabajo)
+
+    def _recibir_arbol(self, arbol):
+        # Las palabras que el usuario agregó mientras se cargaba tienen prioridad
+        arbol.insertar_muchos(self.bst.inorder())
+        self.bst = arbol
+        self.actualizar_lista()
+
+    def _aplicar_registro(self):
+        """Aplica las ediciones guardadas en el registro desde el último snapshot."""
+        self.registro.reproducir(self.bst)
+        self._compactacion_permitida = True
         self.actualizar_lista()
 
+    def _compactar_registro(self):
+        if self._compactacion_permitida and self._importacion is None:
+            # El snapshot se escribe en otro hilo; aquí sólo se copia el árbol
+            self.registro.compactar(self.bst, SNAPSHOT_PATH)
+
+    def closeEvent(self, event):
+        self.cancelar_exportacion()
+        self.registro.cerrar()
+        super().closeEvent(event)
+
+    def _carga_terminada(self, errores):
+        self.barra_progreso.hide()
+        self._aplicar_registro()
+        estado = f"Diccionario cargado: {len(self.bst)} palabras."
+        if self._carga.texto_ignorado:
+            # Importarlo lo guarda en el registro como cualquier otra edición
+            estado += (f" '{DATA_PATH}' cambió después del último guardado y no se aplicó;"
+                       " use Importar glosarios para agregar sus palabras.")
+        self._carga = None
+        self.label_estado.setText(estado + self._describir_errores(errores))
+
+    def _describir_errores(self, errores):
+        if not errores:
+            return ""
+        # Se muestran sólo las primeras líneas para no llenar la ventana.
+        # Al importar varios archivos cada error viene como (ruta, línea).
+        lineas = ", ".join(
+            f"{os.path.basename(e[0])}:{e[1]}" if isinstance(e, tuple) else str(e)
+            for e in errores[:10]
+        )
+        if len(errores) > 10:
+            lineas += ", ..."
+        return f" {len(errores)} líneas con formato inválido (líneas {lineas})."
+
+    def _carga_fallida(self, mensaje):
+        self.barra_progreso.hide()
+        self.label_estado.setText("")
+        QMessageBox.critical(self, "Error al cargar", f"No se pudo cargar el diccionario: {mensaje}")
+
     # --- PESTAÑA DE GESTIÓN (AGREGAR/ELIMINAR) ---
     def _setup_gestion_tab(self):
         layout = QVBoxLayout(self.tab_gestion)
@@ -90,6 +442,11 @@ class DiccionarioGUI(QWidget):
         self.btn_agregar.setStyleSheet("background-color: #28a745; color: white;")
         self.btn_agregar.clicked.connect(self.agregar_par)
         add_layout.addWidget(self.btn_agregar, 2, 0, 1, 2)
+
+        # Suma la traducción a las que ya tiene la palabra en lugar de reemplazarlas
+        self.btn_agregar_significado = QPushButton("➕ AGREGAR OTRA TRADUCCIÓN")
+        self.btn_agregar_significado.clicked.connect(self.agregar_significado)
+        add_layout.addWidget(self.btn_agregar_significado, 3, 0, 1, 2)
         
         group_add.setLayout(add_layout)
         layout.addWidget(group_add)
@@ -107,6 +464,11 @@ class DiccionarioGUI(QWidget):
         
         group_del.setLayout(del_layout)
         layout.addWidget(group_del)
+
+        # Importar uno o más archivos 'palabra:traduccion' sobre el diccionario actual
+        self.btn_importar = QPushButton("📥 IMPORTAR GLOSARIOS")
+        self.btn_importar.clicked.connect(self.importar_glosario)
+        layout.addWidget(self.btn_importar)
         
         layout.addStretch(1)
 
@@ -121,19 +483,34 @@ class DiccionarioGUI(QWidget):
         self.input_buscar = QLineEdit()
         self.input_buscar.setPlaceholderText("Escriba la palabra en Español y presione 'Enter' o el botón.")
         self.input_buscar.returnPressed.connect(self.buscar_palabra)
+        self.input_buscar.textEdited.connect(self.actualizar_sugerencias)
         search_layout.addWidget(self.input_buscar)
 
         self.btn_buscar = QPushButton("🔍 Buscar")
         self.btn_buscar.clicked.connect(self.buscar_palabra)
         search_layout.addWidget(self.btn_buscar)
+
+        self.btn_buscar_inversa = QPushButton("🔄 Inglés → Español")
+        self.btn_buscar_inversa.clicked.connect(self.buscar_inversa)
+        search_layout.addWidget(self.btn_buscar_inversa)
         
         group_search.setLayout(search_layout)
         layout.addWidget(group_search)
+
+        # Sugerencias mientras se escribe (autocompletado por prefijo)
+        self.lista_sugerencias = QListWidget()
+        self.lista_sugerencias.setMaximumHeight(90)
+        self.lista_sugerencias.itemClicked.connect(self.elegir_sugerencia)
+        layout.addWidget(self.lista_sugerencias)
         
         # 2. Lista de Diccionario (Inorder)
         layout.addWidget(QLabel("Diccionario Actual (Orden Alfabético):"))
         
-        self.lista = QListWidget() 
+        # QListView + modelo: sólo se dibujan las filas visibles
+        self.modelo = ModeloDiccionario(self.bst, self)
+        self.lista = QListView()
+        self.lista.setUniformItemSizes(True)
+        self.lista.setModel(self.modelo)
         layout.addWidget(self.lista)
         
         # 3. Exportar
@@ -145,34 +522,76 @@ class DiccionarioGUI(QWidget):
 
     # --- MÉTODOS DE LA LÓGICA (Funciones del BST) ---
     
-    # LA FUNCIÓN CORREGIDA QUE ELIMINA EL TEXTO MOLESTO
     def actualizar_lista(self):
-        self.lista.clear()
-        try:
-            # Se asegura que SÓLO se usen los pares (palabra, traduccion)
-            for palabra, traduccion in self.bst.inorder():
-                self.lista.addItem(f"{palabra} = {traduccion}")
-        except Exception as e:
-            # En caso de error, muestra un mensaje útil en la GUI
-            QMessageBox.critical(self, "Error al Cargar Lista", f"Ocurrió un error al cargar la lista. Revise bst.py. Error: {e}")
+        # Sólo para cambios masivos; las ediciones sueltas pasan por el modelo
+        self.modelo.reiniciar(self.bst)
 
 
+    def _importacion_en_curso(self):
+        if self._importacion is not None:
+            QMessageBox.information(self, "Importar", "Espere a que termine la importación.")
+            return True
+        return False
+
     def agregar_par(self):
+        if self._importacion_en_curso():
+            return
         palabra = self.input_palabra.text().strip()
         traduccion = self.input_traduccion.text().strip()
         if not palabra or not traduccion:
             QMessageBox.warning(self, "Error", "Debe ingresar palabra y traducción para agregar.")
             return
         
-        is_update = self.bst.buscar_traduccion(palabra) is not None
-        self.bst.insertar_par(palabra, traduccion)
+        # El modelo indica si la palabra ya existía y repinta sólo su fila
+        is_update = self.modelo.insertar(palabra, traduccion)
+        self.registro.registrar_insercion(palabra, traduccion, reemplazo=is_update)
+        if self.registro.registros >= LIMITE_REGISTRO:
+            self._compactar_registro()
         
         msg = "reemplazada" if is_update else "agregada"
         QMessageBox.information(self, "Éxito", f"La palabra '{palabra}' ha sido {msg}.")
         
         self.input_palabra.clear()
         self.input_traduccion.clear()
-        self.actualizar_lista()
+
+    def agregar_significado(self):
+        if self._importacion_en_curso():
+            return
+        palabra = self.input_palabra.text().strip()
+        traduccion = self.input_traduccion.text().strip()
+        if not palabra or not traduccion:
+            QMessageBox.warning(self, "Error", "Debe ingresar palabra y traducción para agregar.")
+            return
+
+        combinada = self.bst.traduccion_ampliada(palabra, traduccion)
+        if combinada is None:
+            QMessageBox.information(self, "Sin cambios", f"'{palabra}' ya tiene la traducción '{traduccion}'.")
+            return
+        # Se guarda la traducción completa, así el registro se reproduce igual
+        is_update = self.modelo.insertar(palabra, combinada)
+        self.registro.registrar_insercion(palabra, combinada, reemplazo=is_update)
+        if self.registro.registros >= LIMITE_REGISTRO:
+            self._compactar_registro()
+
+        QMessageBox.information(self, "Éxito", f"Traducciones de '{palabra}': {combinada}.")
+        self.input_palabra.clear()
+        self.input_traduccion.clear()
+
+    def buscar_inversa(self):
+        traduccion = self.input_buscar.text().strip()
+        if not traduccion:
+            QMessageBox.information(self, "Búsqueda", "Ingrese una palabra en Inglés para buscar.")
+            return
+        palabras = self.bst.buscar_inversa(traduccion)
+        if palabras:
+            QMessageBox.information(
+                self, "Traducción encontrada",
+                f"'{traduccion.upper()}' es la traducción de:\n{', '.join(palabras).upper()}"
+            )
+        else:
+            QMessageBox.information(self, "No encontrada", f"Ninguna palabra se traduce como '{traduccion}'.")
+        self.input_buscar.clear()
+        self.lista_sugerencias.clear()
 
     def buscar_palabra(self):
         palabra = self.input_buscar.text().strip()
@@ -182,30 +601,156 @@ class DiccionarioGUI(QWidget):
         traduccion = self.bst.buscar_traduccion(palabra)
         if traduccion:
             QMessageBox.information(self, "Traducción encontrada", f"'{palabra.upper()}' se traduce como:\n{traduccion.upper()}")
-        else:
+            self.input_buscar.clear()
+            self.lista_sugerencias.clear()
+            return
+
+        parecidas = self.bst.sugerencias(palabra, limite=MAX_SUGERENCIAS)
+        if not parecidas:
             QMessageBox.information(self, "No encontrada", f"No se encontró traducción para '{palabra}'.")
-        self.input_buscar.clear()
+            self.input_buscar.clear()
+            self.lista_sugerencias.clear()
+            return
+        QMessageBox.information(
+            self, "No encontrada",
+            f"No se encontró traducción para '{palabra}'.\n¿Quiso decir: {', '.join(parecidas)}?"
+        )
+        # Las propuestas quedan en la lista de sugerencias para elegirlas con un clic
+        self.lista_sugerencias.clear()
+        for parecida in parecidas:
+            self.lista_sugerencias.addItem(f"{parecida} = {self.bst.buscar_traduccion(parecida)}")
+
+    def importar_glosario(self):
+        if not self._compactacion_permitida:
+            QMessageBox.information(self, "Importar", "Espere a que termine de cargarse el diccionario.")
+            return
+        if self._importacion_en_curso():
+            return
+        rutas, _ = QFileDialog.getOpenFileNames(
+            self, "Importar glosarios", "", "Diccionarios (*.txt);;Todos los archivos (*)"
+        )
+        if not rutas:
+            return
+
+        # Los archivos se parsean en paralelo y se mezclan con una copia (O(1))
+        # del diccionario; el árbol llega listo para reemplazar al actual
+        self.barra_progreso.setValue(0)
+        self.barra_progreso.show()
+        self.label_estado.setText(f"Importando {len(rutas)} archivo(s)...")
+        trabajo = TrabajoImportacion(rutas, self.bst.copiar(), self.registro)
+        trabajo.senales.arbol.connect(self._recibir_importado)
+        trabajo.senales.progreso.connect(self.barra_progreso.setValue)
+        trabajo.senales.terminado.connect(self._importacion_terminada)
+        trabajo.senales.error.connect(self._importacion_fallida)
+        self._importacion = trabajo
+        QThreadPool.globalInstance().start(trabajo)
+
+    def _recibir_importado(self, arbol):
+        self.bst = arbol
+        self.actualizar_lista()
+
+    def _importacion_terminada(self, errores):
+        cambios = self._importacion.cambios
+        self._importacion = None
+        self.barra_progreso.hide()
+        if self.registro.registros >= LIMITE_REGISTRO:
+            self._compactar_registro()
+        estado = (f"Glosario importado: {cambios['agregadas']} palabras agregadas, "
+                  f"{cambios['reemplazadas']} reemplazadas.")
+        self.label_estado.setText(estado + self._describir_errores(errores))
+
+    def _importacion_fallida(self, mensaje):
+        self._importacion = None
+        self._carga_fallida(mensaje)
+
+    def actualizar_sugerencias(self, texto):
+        self.lista_sugerencias.clear()
+        texto = texto.strip()
+        if not texto:
+            return
+        # prefijo() sólo recorre las ramas que pueden empezar con el texto escrito
+        for palabra, traduccion in self.bst.prefijo(texto, limite=MAX_SUGERENCIAS):
+            self.lista_sugerencias.addItem(f"{palabra} = {traduccion}")
+
+    def elegir_sugerencia(self, item):
+        palabra = item.text().split(" = ", 1)[0]
+        self.input_buscar.setText(palabra)
+        self.buscar_palabra()
 
     def eliminar_palabra(self):
+        if self._importacion_en_curso():
+            return
         palabra = self.input_palabra.text().strip()
         if not palabra:
             QMessageBox.warning(self, "Error", "Ingrese la palabra que desea eliminar en el campo de texto superior de 'Gestión'.")
             return
         
-        if self.bst.buscar_traduccion(palabra):
-            self.bst.eliminar_palabra(palabra)
+        if self.modelo.eliminar(palabra):
+            self.registro.registrar_eliminacion(palabra)
+            if self.registro.registros >= LIMITE_REGISTRO:
+                self._compactar_registro()
             QMessageBox.information(self, "Eliminación exitosa", f"La palabra '{palabra}' ha sido eliminada del diccionario.")
         else:
             QMessageBox.warning(self, "Error de eliminación", f"La palabra '{palabra}' no se encontró en el diccionario.")
             
         self.input_palabra.clear()
-        self.actualizar_lista()
 
     def exportar_diccionario(self):
+        if self._exportacion is not None:
+            return
         os.makedirs(OUTPUTS_DIR, exist_ok=True)
-        exportar_inorder(self.bst, os.path.join(OUTPUTS_DIR, "diccionario_ordenado.txt"))
-        exportar_recorridos(self.bst, os.path.join(OUTPUTS_DIR, "recorridos_diccionario.txt"))
-        QMessageBox.information(self, "Exportado", f"Archivos guardados en la carpeta '{OUTPUTS_DIR}/'.")
+        # La copia se toma aquí, en el hilo de la GUI, y es O(1) porque el
+        # árbol es persistente; el hilo de exportación sólo la lee, así se
+        # puede seguir editando mientras se escribe
+        trabajo = TrabajoExportacion(
+            self.bst.copiar(),
+            os.path.join(OUTPUTS_DIR, "diccionario_ordenado.txt"),
+            os.path.join(OUTPUTS_DIR, "recorridos_diccionario.txt"),
+        )
+        trabajo.senales.progreso.connect(self.barra_progreso.setValue)
+        trabajo.senales.terminado.connect(self._exportacion_terminada)
+        trabajo.senales.cancelado.connect(self._exportacion_cancelada)
+        trabajo.senales.error.connect(self._exportacion_fallida)
+        self._exportacion = trabajo
+
+        self.btn_exportar.setEnabled(False)
+        self.btn_cancelar.setEnabled(True)
+        self.btn_cancelar.show()
+        self.barra_progreso.setValue(0)
+        self.barra_progreso.show()
+        self.label_estado.setText("Exportando diccionario...")
+        QThreadPool.globalInstance().start(trabajo)
+
+    def cancelar_exportacion(self):
+        if self._exportacion is not None:
+            self._exportacion.cancelar()
+            self.btn_cancelar.setEnabled(False)
+
+    def _fin_exportacion(self):
+        self._exportacion = None
+        self.btn_exportar.setEnabled(True)
+        self.btn_cancelar.hide()
+        self.barra_progreso.hide()
+
+    def _exportacion_terminada(self, _):
+        self._fin_exportacion()
+        # Guardar un snapshot nuevo deja vacío el registro de operaciones y
+        # permite que el próximo arranque no re-parsee el texto
+        self._compactar_registro()
+        self.label_estado.setText("Exportación terminada.")
+        QMessageBox.information(
+            self, "Exportado",
+            f"Archivos guardados en la carpeta '{OUTPUTS_DIR}/' y snapshot en '{SNAPSHOT_PATH}'."
+        )
+
+    def _exportacion_cancelada(self):
+        self._fin_exportacion()
+        self.label_estado.setText("Exportación cancelada; los archivos anteriores no se modificaron.")
+
+    def _exportacion_fallida(self, mensaje):
+        self._fin_exportacion()
+        self.label_estado.setText("")
+        QMessageBox.critical(self, "Error al exportar", f"No se pudo exportar el diccionario: {mensaje}")
 
 
 if __name__ == "__main__":
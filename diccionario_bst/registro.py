@@ -0,0 +1,191 @@
+# registro.py
+
+import os
+import json
+import time
+import threading
+
+from functions import exportar_binario
+
+
+class RegistroOperaciones:
+    """Registro de sólo-agregar (write-ahead log) con las ediciones del diccionario.
+
+    Cada inserción, reemplazo o eliminación se agrega como una línea JSON:
+    ``["I", palabra, traduccion]``, ``["R", palabra, traduccion]`` o
+    ``["D", palabra]``. Guardar una edición cuesta O(1) de E/S en lugar de
+    reescribir todo el diccionario.
+
+    Las líneas se vuelcan al sistema operativo en cada edición, pero el
+    ``fsync`` (que es lo caro) se agrupa: se hace cada ``fsync_cada`` registros
+    o cuando pasaron ``intervalo_fsync`` segundos desde el último.
+
+    Al arrancar se carga el último snapshot y se aplica ``reproducir`` encima.
+    ``compactar`` escribe un snapshot nuevo y recorta del registro lo que ya
+    quedó incluido en él.
+    """
+    def __init__(self, ruta_archivo, fsync_cada=32, intervalo_fsync=1.0):
+        self.ruta_archivo = ruta_archivo
+        self.fsync_cada = fsync_cada
+        self.intervalo_fsync = intervalo_fsync
+        self._descartar_linea_incompleta()
+        self.registros = self._contar_registros()
+        self._f = open(ruta_archivo, 'ab')
+        self._lock = threading.Lock()
+        self._pendientes = 0
+        self._ultimo_fsync = time.monotonic()
+        self._compactando = False
+
+    def _descartar_linea_incompleta(self):
+        """Si el archivo termina en una línea a medio escribir, la corta.
+
+        Si no, el próximo registro se pegaría a ella y también se perdería.
+        """
+        if not os.path.exists(self.ruta_archivo):
+            return
+        with open(self.ruta_archivo, 'r+b') as f:
+            fin = f.seek(0, os.SEEK_END)
+            pos = fin
+            while pos > 0:
+                inicio = max(0, pos - 4096)
+                f.seek(inicio)
+                salto = f.read(pos - inicio).rfind(b"\n")
+                if salto != -1:
+                    pos = inicio + salto + 1
+                    break
+                pos = inicio
+            if pos != fin:
+                f.truncate(pos)
+
+    def _contar_registros(self):
+        if not os.path.exists(self.ruta_archivo):
+            return 0
+        with open(self.ruta_archivo, 'rb') as f:
+            return sum(bloque.count(b"\n") for bloque in iter(lambda: f.read(1 << 20), b""))
+
+    # --- Escritura ---
+
+    def registrar_insercion(self, palabra, traduccion, reemplazo=False):
+        self._escribir(["R" if reemplazo else "I", palabra, traduccion])
+
+    def registrar_eliminacion(self, palabra):
+        self._escribir(["D", palabra])
+
+    def registrar_lote(self, pares):
+        """Registra muchas inserciones con una sola escritura y un solo fsync."""
+        self._escribir(*(["I", palabra, traduccion] for palabra, traduccion in pares))
+        self.sincronizar()
+
+    def _escribir(self, *registros):
+        datos = "".join(json.dumps(registro, ensure_ascii=False) + "\n" for registro in registros)
+        with self._lock:
+            self._f.write(datos.encode('utf-8'))
+            self._f.flush()
+            self.registros += len(registros)
+            self._pendientes += len(registros)
+            if (self._pendientes >= self.fsync_cada
+                    or time.monotonic() - self._ultimo_fsync >= self.intervalo_fsync):
+                self._sincronizar()
+
+    def _sincronizar(self):
+        os.fsync(self._f.fileno())
+        self._pendientes = 0
+        self._ultimo_fsync = time.monotonic()
+
+    def sincronizar(self):
+        """Fuerza el fsync de los registros que todavía no se sincronizaron."""
+        with self._lock:
+            if self._pendientes:
+                self._sincronizar()
+
+    def cerrar(self):
+        self.sincronizar()
+        with self._lock:
+            self._f.close()
+
+    # --- Lectura ---
+
+    def reproducir(self, bst):
+        """Aplica sobre ``bst`` todas las operaciones del registro, en orden.
+
+        Devuelve cuántas se aplicaron. Una última línea incompleta (por ejemplo
+        si el programa se cortó a mitad de una escritura) se ignora.
+        """
+        with self._lock:
+            self._f.flush()
+        aplicadas = 0
+        with open(self.ruta_archivo, 'rb') as f:
+            for numero, linea in enumerate(f, start=1):
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    print(f"Registro dañado en la línea {numero} de '{self.ruta_archivo}', se ignora.")
+                    continue
+                if registro[0] in ("I", "R"):
+                    bst.insertar_par(registro[1], registro[2])
+                elif registro[0] == "D":
+                    bst.eliminar_palabra(registro[1])
+                aplicadas += 1
+        return aplicadas
+
+    # --- Compactación ---
+
+    def compactar(self, bst, ruta_snapshot, en_segundo_plano=True, al_terminar=None):
+        """Guarda un snapshot de ``bst`` y quita del registro lo que ya contiene.
+
+        Se llama desde el hilo que modifica el árbol: aquí sólo se toma una copia
+        y se anota hasta dónde llega el registro. El snapshot y el recorte se
+        hacen en un hilo aparte, mientras las ediciones siguen agregándose. Si el
+        programa se corta entre los dos pasos no se pierde nada, porque volver a
+        aplicar registros ya incluidos en el snapshot deja el mismo resultado.
+
+        ``al_terminar(exito)`` se llama desde ese hilo. Devuelve False si ya
+        había una compactación en curso.
+        """
+        with self._lock:
+            if self._compactando:
+                return False
+            self._compactando = True
+            self._f.flush()
+            corte = self._f.tell()
+        copia = bst.copiar()
+
+        def trabajo():
+            exito = False
+            try:
+                if exportar_binario(copia, ruta_snapshot):
+                    self._recortar(corte)
+                    exito = True
+            except OSError as e:
+                print(f"Error al compactar el registro: {e}")
+            finally:
+                self._compactando = False
+                if al_terminar is not None:
+                    al_terminar(exito)
+
+        if en_segundo_plano:
+            threading.Thread(target=trabajo, daemon=True).start()
+        else:
+            trabajo()
+        return True
+
+    def _recortar(self, corte):
+        """Deja en el registro sólo lo escrito después del byte ``corte``."""
+        temporal = self.ruta_archivo + ".tmp"
+        with self._lock:
+            self._f.flush()
+            with open(self.ruta_archivo, 'rb') as f:
+                f.seek(corte)
+                resto = f.read()
+            with open(temporal, 'wb') as f:
+                f.write(resto)
+                f.flush()
+                os.fsync(f.fileno())
+            # En Windows no se puede reemplazar un archivo abierto
+            self._f.close()
+            try:
+                os.replace(temporal, self.ruta_archivo)
+            finally:
+                self._f = open(self.ruta_archivo, 'ab')
+            self.registros = resto.count(b"\n")
+            self._pendientes = 0
@@ -1,160 +1,162 @@
 # pycalc.py
-"""Una calculadora sencilla construida con Python y PyQt6."""
+"""Una calculadora sencilla construida con Python y PyQt6.
 
+Este módulo tiene el Modelo y el punto de entrada; la ventana está en
+``pycalc_gui`` y PyQt6 se importa recién al abrirla, así el modelo se puede
+usar sin Qt:
+
+    python -m pycalc                        abre la calculadora
+    python -m pycalc --batch [archivo]      evalúa una expresión por línea
+                                            (de stdin si no se da archivo)
+    python -m pycalc --batch datos.txt --workers 4
+
+En modo batch cada línea de entrada da una línea de salida con su resultado
+(o ``ERROR``), en el mismo orden; las líneas vacías quedan vacías.
+"""
+
+import argparse
+import os
 import sys
-from functools import partial
-
-from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import (
-    QApplication,
-    QMainWindow,
-    QWidget,
-    QGridLayout,
-    QLineEdit,
-    QPushButton,
-    QVBoxLayout,
-)
+from itertools import islice
+
+from pycalc_engine import calculate, formatResult
 
 # Constantes de la aplicación
 ERROR_MSG = "ERROR"
-WINDOW_SIZE = 235
-DISPLAY_HEIGHT = 35
-BUTTON_SIZE = 40
+# Motor numérico del modelo: con "decimal" 0.1+0.2 da 0.3 y los enteros
+# siguen siendo exactos (ver pycalc_engine)
+NUMERIC_BACKEND = "decimal"
+DECIMAL_PRECISION = 28
+# Líneas que se evalúan y escriben juntas en modo batch (y que recibe cada
+# proceso cuando se reparte el trabajo)
+BATCH_CHUNK = 4096
+
+# Nombres que antes estaban en este módulo y ahora viven en pycalc_gui
+_GUI_NAMES = {"PyCalcWindow", "PyCalc", "WINDOW_SIZE", "DISPLAY_HEIGHT", "BUTTON_SIZE"}
+
+
+def __getattr__(name):
+    # Compatibilidad con ``from pycalc import PyCalcWindow``: la interfaz (y
+    # con ella PyQt6) se importa sólo cuando alguien la pide
+    if name in _GUI_NAMES:
+        import pycalc_gui
+        return getattr(pycalc_gui, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 # --- EL MODELO (Lógica de Negocio) ---
 
-def evaluateExpression(expression):
-    """Evalúa una expresión matemática (Modelo)."""
+def evaluateExpression(expression, variables=None, backend=NUMERIC_BACKEND,
+                       precision=DECIMAL_PRECISION):
+    """Evalúa una expresión matemática (Modelo).
+
+    Usa el motor de ``pycalc_engine`` en lugar de ``eval``: sólo acepta
+    aritmética, guarda las expresiones ya compiladas y limita el tamaño de
+    los resultados. ``variables`` da los valores de los nombres que use la
+    expresión; para evaluar columnas enteras ver ``pycalc_engine.evaluateBatch``.
+    ``backend`` elige la aritmética ("float", "decimal" o "fraction") y
+    ``precision`` los dígitos del motor decimal. El resultado se arma con
+    ``formatResult``, que no se traba con enteros de miles de dígitos.
+    """
     try:
-        # Usa diccionarios vacíos para 'globals' y 'locals' por seguridad
-        result = str(eval(expression, {}, {}))
+        result = formatResult(calculate(expression, variables, backend, precision), precision)
     except Exception:
         result = ERROR_MSG
     return result
 
 
-# --- LA VISTA (GUI) ---
-
-class PyCalcWindow(QMainWindow):
-    """La Vista (GUI) de la calculadora."""
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("PyCalc")
-        self.setFixedSize(WINDOW_SIZE, WINDOW_SIZE)
-        
-        # Configuración del widget central y el layout principal
-        self.generalLayout = QVBoxLayout()
-        self._centralWidget = QWidget(self)
-        self.setCentralWidget(self._centralWidget)
-        self._centralWidget.setLayout(self.generalLayout)
-        
-        # Crea la pantalla y los botones
-        self._createDisplay()
-        self._createButtons()
-
-    def _createDisplay(self):
-        """Crea el widget de visualización (QLineEdit)."""
-        self.display = QLineEdit()
-        self.display.setFixedSize(WINDOW_SIZE - 10, DISPLAY_HEIGHT)
-        self.display.setAlignment(Qt.AlignmentFlag.AlignRight)
-        self.display.setReadOnly(True)
-        
-        # Añade la pantalla al layout general
-        self.generalLayout.addWidget(self.display)
-
-    def _createButtons(self):
-        """Crea los botones del teclado de la calculadora."""
-        self.buttonMap = {}
-        buttonsLayout = QGridLayout()
-        
-        # Definición del teclado: [fila][columna]
-        keyBoard = [
-            ["7", "8", "9", "/", "C"],
-            ["4", "5", "6", "*", "("],
-            ["1", "2", "3", "-", ")"],
-            ["0", "00", ".", "+", "="],
-        ]
-        
-        # Creación y posicionamiento de los botones en el QGridLayout
-        for row, keys in enumerate(keyBoard):
-            for col, key in enumerate(keys):
-                self.buttonMap[key] = QPushButton(key)
-                self.buttonMap[key].setFixedSize(BUTTON_SIZE, BUTTON_SIZE)
-                buttonsLayout.addWidget(self.buttonMap[key], row, col)
-                
-        # Añade el layout de los botones al layout general
-        self.generalLayout.addLayout(buttonsLayout)
-
-    def setDisplayText(self, text):
-        """Establece el texto en la pantalla."""
-        self.display.setText(text)
-        self.display.setFocus()
-        
-    def displayText(self):
-        """Obtiene el texto actual de la pantalla."""
-        return self.display.text()
-
-    def clearDisplay(self):
-        """Limpia el texto de la pantalla."""
-        self.setDisplayText("")
-
-
-# --- EL CONTROLADOR (Manejo de Eventos) ---
-
-class PyCalc:
-    """Clase controladora de PyCalc."""
-    def __init__(self, model, view):
-        self._evaluate = model
-        self._view = view
-        self._connectSignalsAndSlots()
-
-    def _calculateResult(self):
-        """Evalúa la expresión actual y muestra el resultado."""
-        result = self._evaluate(expression=self._view.displayText())
-        self._view.setDisplayText(result)
-
-    def _buildExpression(self, subExpression):
-        """Construye la expresión matemática en la pantalla."""
-        # Limpia la pantalla si muestra un mensaje de error
-        if self._view.displayText() == ERROR_MSG:
-            self._view.clearDisplay()
-        
-        expression = self._view.displayText() + subExpression
-        self._view.setDisplayText(expression)
-
-    def _connectSignalsAndSlots(self):
-        """Conecta las señales de los botones con sus slots (métodos)."""
-        for keySymbol, button in self._view.buttonMap.items():
-            if keySymbol not in {"=", "C"}:
-                # Conecta números y operadores a _buildExpression
-                button.clicked.connect(
-                    partial(self._buildExpression, keySymbol)
-                )
-        
-        # Conecta el botón "=" y la tecla Enter para calcular el resultado
-        self._view.buttonMap["="].clicked.connect(self._calculateResult)
-        self._view.display.returnPressed.connect(self._calculateResult)
-        
-        # Conecta el botón "C" (Clear)
-        self._view.buttonMap["C"].clicked.connect(self._view.clearDisplay)
+# --- MODO BATCH (sin interfaz gráfica) ---
+
+def _evaluateChunk(task):
+    """Evalúa un bloque de líneas y devuelve su salida ya armada.
+
+    Recibe ``(líneas, motor, precisión)`` en una sola tupla para poder
+    usarse con ``Pool.imap``.
+    """
+    lines, backend, precision = task
+    output = []
+    for line in lines:
+        expression = line.strip()
+        output.append(evaluateExpression(expression, None, backend, precision) if expression else "")
+    output.append("")
+    return "\n".join(output)
+
+
+def _chunks(lines, size):
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def runBatch(lines, output, backend=NUMERIC_BACKEND, precision=DECIMAL_PRECISION,
+             workers=1, chunkSize=BATCH_CHUNK):
+    """Evalúa una expresión por línea y escribe los resultados en ``output``.
+
+    Las líneas se leen y se escriben de a bloques de ``chunkSize``: no se
+    carga toda la entrada en memoria y se hace una escritura por bloque en
+    lugar de una por línea. Con ``workers`` > 1 los bloques se reparten entre
+    procesos; ``imap`` los devuelve en orden, así la salida no cambia.
+    Devuelve la cantidad de líneas procesadas.
+    """
+    tasks = ((chunk, backend, precision) for chunk in _chunks(lines, chunkSize))
+    count = 0
+    if workers > 1:
+        from multiprocessing import Pool
+        with Pool(workers) as pool:
+            for text in pool.imap(_evaluateChunk, tasks):
+                output.write(text)
+                count += text.count("\n")
+    else:
+        for task in tasks:
+            output.write(_evaluateChunk(task))
+            count += len(task[0])
+    output.flush()
+    return count
+
+
+def _parseArguments(argv):
+    parser = argparse.ArgumentParser(prog="pycalc", description="Calculadora PyCalc.")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="ARCHIVO",
+                        help="evalúa una expresión por línea del archivo (o de stdin) sin abrir la ventana")
+    parser.add_argument("--backend", default=NUMERIC_BACKEND, choices=("float", "decimal", "fraction"),
+                        help="motor numérico (por defecto %(default)s)")
+    parser.add_argument("--precision", type=int, default=DECIMAL_PRECISION,
+                        help="dígitos del motor decimal (por defecto %(default)s)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos para repartir el modo batch (por defecto %(default)s)")
+    return parser.parse_args(argv)
 
 
 # --- FUNCIÓN PRINCIPAL DE EJECUCIÓN ---
 
-def main():
-    """Función principal para ejecutar la aplicación."""
-    pycalc = QApplication(sys.argv)
-    
-    # Crea instancias de la Vista (View)
-    view = PyCalcWindow()
-    view.show()
-    
-    # Define el Modelo (Model) y crea el Controlador (Controller)
-    model = evaluateExpression
-    PyCalc(model=model, view=view)
-    
-    # Inicia el bucle de eventos de la aplicación
-    sys.exit(pycalc.exec())
+def main(argv=None):
+    """Función principal: abre la calculadora o, con ``--batch``, evalúa sin ventana."""
+    args = _parseArguments(argv)
+    if args.batch is None:
+        import pycalc_gui
+        pycalc_gui.main()
+        return
+
+    # Si se escribe a mano en la terminal, cada resultado sale apenas se
+    # termina la línea; si no, se evalúa de a bloques
+    if args.batch == "-":
+        source = sys.stdin
+        chunkSize = 1 if sys.stdin.isatty() else BATCH_CHUNK
+    else:
+        source = open(args.batch, encoding="utf-8")
+        chunkSize = BATCH_CHUNK
+    try:
+        runBatch(source, sys.stdout, args.backend, args.precision, args.workers, chunkSize)
+    except BrokenPipeError:
+        # La salida se cerró antes (p. ej. "| head"): no es un error. Se
+        # redirige stdout a devnull para que Python no falle al cerrarlo.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if source is not sys.stdin:
+            source.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
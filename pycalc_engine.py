@@ -0,0 +1,735 @@
+# pycalc_engine.py
+"""Motor aritmético de PyCalc: reemplaza a eval() por un evaluador propio.
+
+Una expresión se procesa en dos pasos:
+
+1. ``compileExpression`` la separa en tokens y, con el algoritmo
+   shunting-yard, la traduce a un programa en notación polaca inversa (RPN):
+   una tupla de instrucciones ``(tipo, función, valor)``. El resultado se
+   guarda en un caché LRU por texto, así repetir "=" sobre la misma expresión
+   no vuelve a analizarla.
+2. ``evaluateProgram`` ejecuta el programa con una pila en un solo bucle.
+
+La aritmética la da un motor numérico que se elige en cada evaluación:
+``"float"`` (enteros y floats de Python, el más rápido), ``"decimal"``
+(``decimal.Decimal`` con la precisión pedida, así ``0.1+0.2`` da ``0.3``;
+los enteros siguen siendo exactos) o
+``"fraction"`` (``fractions.Fraction``, racionales exactos). ``formatResult``
+arma el texto de un resultado sin pasar enteros enormes por ``str()``.
+
+Las expresiones pueden usar variables (``precio * (1 + iva)``), cuyos valores
+se pasan al evaluar. ``evaluateBatch`` evalúa un mismo programa sobre
+columnas enteras de NumPy, una operación vectorizada por instrucción en lugar
+de un bucle de Python por fila. ``IncrementalExpression`` mantiene el
+análisis de una expresión que se va escribiendo, para la vista previa.
+
+Sólo se aceptan números, nombres de variables, los operadores ``+ - * / // % **`` (también como
+signo, ``+`` y ``-``) y paréntesis: no hay forma de llegar a otras partes de
+Python. Los límites de largo de la expresión y de tamaño de los enteros
+acotan el tiempo de cualquier evaluación; por ejemplo ``9**9**9`` da error
+en lugar de colgar la interfaz.
+"""
+
+import math
+import operator
+import re
+from bisect import bisect_right
+from contextlib import nullcontext
+from decimal import Context, Decimal, MAX_EMAX, MIN_EMIN, getcontext, localcontext
+from fractions import Fraction
+from functools import lru_cache
+from numbers import Integral
+
+# Tipos de instrucción del programa RPN
+PUSH, UNARY, BINARY, LOAD = 0, 1, 2, 3
+
+# Límites
+MAX_EXPRESSION_LENGTH = 1000
+MAX_INT_BITS = 1 << 18  # ~78.900 dígitos
+MAX_PRECISION = 10000  # dígitos del motor decimal
+# Una potencia con exponente no entero cuesta cerca del cubo de la precisión
+# (a 10000 dígitos, segundos por término): por encima de esto no se calcula
+MAX_POWER_PRECISION = 300
+DECIMAL_PRECISION = 28
+CACHE_SIZE = 256
+# Resultados con más dígitos que esto se muestran en notación científica
+# (queda por debajo del límite de 4300 dígitos de int -> str de Python)
+MAX_DISPLAY_DIGITS = 4000
+SCIENTIFIC_DIGITS = 15
+
+
+class CalcError(ValueError):
+    """Expresión inválida o resultado fuera de los límites del motor."""
+
+
+# --- Operaciones con límites ---
+
+def _checkBits(bits):
+    if bits > MAX_INT_BITS:
+        raise CalcError("el resultado es demasiado grande")
+
+
+def _multiply(a, b):
+    if type(a) is int and type(b) is int:
+        _checkBits(a.bit_length() + b.bit_length())
+    return a * b
+
+
+def _power(a, b):
+    if type(a) is int and type(b) is int and b > 0 and abs(a) > 1:
+        # El resultado tiene alrededor de bits(a) * b bits: se revisa antes de calcularlo
+        _checkBits((a.bit_length() - 1) * b)
+    result = a ** b
+    if type(result) is complex:
+        # p. ej. (-8) ** 0.5; la calculadora sólo trabaja con números reales
+        raise CalcError("el resultado no es un número real")
+    return result
+
+
+def _decimalDivmod(a, b):
+    """divmod que redondea hacia abajo como Python (el de Decimal trunca hacia cero)."""
+    quotient, remainder = divmod(a, b)
+    if remainder and (remainder < 0) != (b < 0):
+        quotient -= 1
+        remainder += b
+    return quotient, remainder
+
+
+def _decimalFloorDiv(a, b):
+    return _decimalDivmod(a, b)[0]
+
+
+def _decimalMod(a, b):
+    return _decimalDivmod(a, b)[1]
+
+
+def _checkRational(value):
+    # Los racionales crecen también al sumar (se multiplican los denominadores):
+    # se revisa el tamaño después de cada operación
+    if type(value) is Fraction:
+        _checkBits(max(value.numerator.bit_length(), value.denominator.bit_length()))
+    elif type(value) is int:
+        _checkBits(value.bit_length())
+    return value
+
+
+def _rational(function):
+    def checked(a, b):
+        return _checkRational(function(a, b))
+    return checked
+
+
+def _rationalPower(a, b):
+    if type(a) is Fraction and type(b) is Fraction and b.denominator == 1:
+        bits = max(a.numerator.bit_length(), a.denominator.bit_length())
+        if bits > 1:
+            _checkBits((bits - 1) * abs(b.numerator))
+    # Con un exponente no entero el resultado ya no es racional y queda float
+    return _checkRational(_power(a, b))
+
+
+# En el motor decimal los enteros se quedan como int (exactos y con el límite
+# de MAX_INT_BITS) mientras no se mezclen con un Decimal; sólo la división y
+# las potencias negativas, que con int darían float, pasan a Decimal
+
+def _decimalDivide(a, b):
+    if type(a) is int and type(b) is int:
+        a = Decimal(a)
+    return a / b
+
+
+def _decimalPower(a, b):
+    if type(a) is int and type(b) is int and b < 0:
+        a = Decimal(a)
+    elif (type(b) is Decimal and b != b.to_integral_value()
+          and getcontext().prec > MAX_POWER_PRECISION):
+        raise CalcError("potencia con exponente no entero a demasiada precisión")
+    result = _power(a, b)
+    if type(result) is Decimal and not result.is_finite():
+        # Decimal da Infinity para 0 ** -1 sin avisar
+        raise ZeroDivisionError("potencia negativa de cero")
+    return result
+
+
+# --- Motores numéricos ---
+
+def _floatNumber(text):
+    isFloat = "." in text or "e" in text or "E" in text
+    return float(text) if isFloat else int(text)
+
+
+def _decimalNumber(text):
+    isDecimal = "." in text or "e" in text or "E" in text
+    return Decimal(text) if isDecimal else int(text)
+
+
+def _toDecimal(value):
+    # isinstance y no type(): los valores pueden venir de NumPy (np.float64
+    # es subclase de float; np.int64 está registrado como Integral)
+    if isinstance(value, Integral):
+        return int(value)
+    if isinstance(value, float):
+        # repr da el float más corto que lo representa: 0.1 y no 0.1000000000000000055...
+        return Decimal(repr(float(value)))
+    if isinstance(value, Fraction):
+        return Decimal(value.numerator) / value.denominator
+    return Decimal(value)
+
+
+def _fractionNumber(text):
+    # Fraction arma el entero 10**exponente completo: se revisa su tamaño antes
+    exponent = text.lower().partition("e")[2]
+    if exponent and abs(int(exponent)) * math.log2(10) > MAX_INT_BITS:
+        raise CalcError("el número es demasiado grande")
+    return Fraction(text)
+
+
+def _toFraction(value):
+    if isinstance(value, Integral):
+        return Fraction(int(value))
+    return Fraction(repr(float(value))) if isinstance(value, float) else Fraction(value)
+
+
+def _decimalContext(precision):
+    if not 1 <= precision <= MAX_PRECISION:
+        raise CalcError(f"la precisión tiene que estar entre 1 y {MAX_PRECISION}")
+    return localcontext(Context(prec=precision))
+
+
+class Backend:
+    """Aritmética con la que se evalúa una expresión.
+
+    ``number`` convierte el texto de un número de la expresión, ``convert``
+    adapta el valor de una variable (None si no hace falta), ``operations``
+    da la función de cada operador, con los límites de tamaño ya aplicados, y
+    ``context(precision)`` el contexto en el que se evalúa.
+    """
+    def __init__(self, name, number, convert, operations, context):
+        self.name = name
+        self.number = number
+        self.convert = convert
+        self.operations = operations
+        self.context = context
+
+    def __repr__(self):
+        return f"Backend({self.name!r})"
+
+
+FLOAT = Backend("float", _floatNumber, None, {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": _multiply,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+    "**": _power,
+    "neg": operator.neg,
+}, lambda precision: nullcontext())
+
+# Decimal no crece más allá de la precisión del contexto y avisa de los
+# desbordes con sus propias excepciones (decimal.Overflow, DivisionByZero...)
+DECIMAL = Backend("decimal", _decimalNumber, _toDecimal, {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": _multiply,
+    "/": _decimalDivide,
+    "//": _decimalFloorDiv,
+    "%": _decimalMod,
+    "**": _decimalPower,
+    "neg": operator.neg,
+}, _decimalContext)
+
+FRACTION = Backend("fraction", _fractionNumber, _toFraction, {
+    "+": _rational(operator.add),
+    "-": _rational(operator.sub),
+    "*": _rational(operator.mul),
+    "/": _rational(operator.truediv),
+    "//": _rational(operator.floordiv),
+    "%": _rational(operator.mod),
+    "**": _rationalPower,
+    "neg": operator.neg,
+}, lambda precision: nullcontext())
+
+BACKENDS = {backend.name: backend for backend in (FLOAT, DECIMAL, FRACTION)}
+
+
+def getBackend(backend):
+    """Acepta un ``Backend`` o su nombre ("float", "decimal", "fraction")."""
+    if isinstance(backend, Backend):
+        return backend
+    try:
+        return BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"motor numérico desconocido: {backend!r}") from None
+
+
+# --- Tokens ---
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+        (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+      | (?P<operator>\*\*|//|[-+*/%()])
+      | (?P<name>[A-Za-z_]\w*)
+    )""", re.VERBOSE)
+
+
+class Variable(str):
+    """Token con el nombre de una variable (para distinguirlo de los operadores)."""
+
+
+def tokenize(expression, number=_floatNumber):
+    """Separa la expresión en números, operadores (str) y ``Variable``.
+
+    ``number`` convierte el texto de cada número; por defecto da int o float.
+    """
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise CalcError("la expresión es demasiado larga")
+    return [token for _, token in _scan(expression, 0, number)]
+
+
+def _scan(expression, pos, number):
+    """Genera ``(fin, token)`` para cada token de la expresión a partir de ``pos``."""
+    end = len(expression.rstrip())
+    while pos < end:
+        match = _TOKEN.match(expression, pos)
+        if match is None:
+            raise CalcError(f"carácter inesperado en la posición {pos}")
+        text = match.group("number")
+        if text is not None:
+            token = number(text)
+        elif match.group("name") is not None:
+            token = Variable(match.group("name"))
+        else:
+            token = match.group("operator")
+        pos = match.end()
+        yield pos, token
+
+
+# --- Compilación (shunting-yard) ---
+
+# Operadores binarios: precedencia y asociatividad a derecha. La función de
+# cada uno la da el motor numérico; en las instrucciones se guarda también el
+# símbolo, que ``evaluateBatch`` usa para elegir la operación de NumPy.
+_BINARY = {
+    "+": (1, False),
+    "-": (1, False),
+    "*": (2, False),
+    "/": (2, False),
+    "//": (2, False),
+    "%": (2, False),
+    "**": (4, True),
+}
+# Como en Python, el signo liga menos que ** a su izquierda (-2**2 == -4)
+# pero más que * y /. El "+" de signo no cambia el valor y no se emite.
+_UNARY_PRECEDENCE = 3
+
+
+def _parseToken(token, operations, negate, pending, expectOperand, emit):
+    """Un paso de shunting-yard: procesa ``token`` y devuelve ``(pending, expectOperand)``.
+
+    ``pending`` es la pila de operadores pendientes, enlazada e inmutable:
+    ``((precedencia, instrucción), resto)`` o ``("(", resto)``, y None si está
+    vacía. Así ``IncrementalExpression`` puede guardar el estado después de
+    cada token sin copiarla. ``expectOperand`` dice si el próximo token tiene
+    que ser un número (o "(" o un signo): así se distingue el "-" de signo
+    del de resta y se detectan expresiones mal formadas. Las instrucciones
+    que quedan listas se pasan a ``emit``.
+    """
+    if type(token) is not str:
+        if not expectOperand:
+            raise CalcError("falta un operador entre dos valores")
+        if type(token) is Variable:
+            emit((LOAD, None, str(token)))
+        else:
+            emit((PUSH, None, token))
+        return pending, False
+    if token == "(":
+        if not expectOperand:
+            raise CalcError("falta un operador antes de '('")
+        return (token, pending), True
+    if token == ")":
+        if expectOperand:
+            raise CalcError("falta un número antes de ')'")
+        while pending is not None and pending[0] != "(":
+            emit(pending[0][1])
+            pending = pending[1]
+        if pending is None:
+            raise CalcError("paréntesis sin abrir")
+        return pending[1], False
+    if expectOperand:
+        if token not in ("-", "+"):
+            raise CalcError(f"falta un número antes de '{token}'")
+        # Un signo es prefijo: se apila sin sacar nada de la pila
+        return ((negate, pending) if token == "-" else pending), True
+    precedence, rightAssociative = _BINARY[token]
+    while pending is not None and pending[0] != "(":
+        top = pending[0][0]
+        if top > precedence or (top == precedence and not rightAssociative):
+            emit(pending[0][1])
+            pending = pending[1]
+        else:
+            break
+    return ((precedence, (BINARY, operations[token], token)), pending), True
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compileExpression(expression, backend="float"):
+    """Traduce la expresión a un programa RPN (tupla de instrucciones).
+
+    Los números y las funciones de las instrucciones son los del motor
+    numérico ``backend``, así que cada motor tiene su propio programa.
+
+    Cada instrucción es ``(PUSH, None, número)`` para apilar un número,
+    ``(LOAD, None, nombre)`` para apilar el valor de una variable,
+    ``(UNARY, función, "neg")`` para el signo menos o
+    ``(BINARY, función, símbolo)`` para un operador binario. Lanza
+    ``CalcError`` si la expresión está mal formada.
+    """
+    backend = getBackend(backend)
+    operations = backend.operations
+    negate = (_UNARY_PRECEDENCE, (UNARY, operations["neg"], "neg"))
+    program = []
+    emit = program.append
+    pending = None
+    expectOperand = True
+    for token in tokenize(expression, backend.number):
+        pending, expectOperand = _parseToken(token, operations, negate, pending, expectOperand, emit)
+
+    if expectOperand:
+        raise CalcError("la expresión está incompleta")
+    while pending is not None:
+        item, pending = pending
+        if item == "(":
+            raise CalcError("paréntesis sin cerrar")
+        emit(item[1])
+    return tuple(program)
+
+
+# --- Evaluación ---
+
+def programVariables(program):
+    """Nombres de las variables que usa un programa, sin repetir y en orden de aparición."""
+    return list(dict.fromkeys(value for kind, _, value in program if kind == LOAD))
+
+
+def evaluateProgram(program, variables=None):
+    """Ejecuta un programa de ``compileExpression`` y devuelve el número resultante.
+
+    ``variables`` es un dict nombre -> número con los valores de las variables.
+    """
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    for kind, function, value in program:
+        if kind == PUSH:
+            push(value)
+        elif kind == BINARY:
+            right = pop()
+            stack[-1] = function(stack[-1], right)
+        elif kind == UNARY:
+            stack[-1] = function(stack[-1])
+        else:
+            try:
+                push(variables[value])
+            except (KeyError, TypeError):
+                raise CalcError(f"la variable '{value}' no tiene valor") from None
+    return stack[0]
+
+
+def calculate(expression, variables=None, backend="float", precision=DECIMAL_PRECISION):
+    """Compila (o toma del caché) y evalúa la expresión con el motor ``backend``.
+
+    ``precision`` es la cantidad de dígitos del motor decimal (los otros la
+    ignoran). Los valores de ``variables`` se convierten al tipo del motor.
+    """
+    backend = getBackend(backend)
+    program = compileExpression(expression, backend.name)
+    with backend.context(precision):
+        if variables and backend.convert is not None:
+            variables = {name: backend.convert(value) for name, value in variables.items()}
+        return evaluateProgram(program, variables)
+
+
+# --- Evaluación incremental (vista previa) ---
+
+# Cuántos caracteres más allá de su fin puede mirar un token: "1" seguido de
+# "e+5" termina siendo "1e+5". Al cambiar el texto se vuelven a analizar los
+# tokens que terminan a menos de esta distancia del primer cambio.
+_LOOKAHEAD = 3
+
+
+def _applyInstruction(instruction, values, variables):
+    """Ejecuta una instrucción sobre una pila de valores enlazada ``(valor, resto)``."""
+    kind, function, value = instruction
+    if kind == PUSH:
+        return (value, values)
+    if kind == BINARY:
+        right, (left, rest) = values
+        return (function(left, right), rest)
+    if kind == UNARY:
+        return (function(values[0]), values[1])
+    try:
+        return (variables[value], values)
+    except (KeyError, TypeError):
+        raise CalcError(f"la variable '{value}' no tiene valor") from None
+
+
+class IncrementalExpression:
+    """Expresión que se escribe de a poco, para mostrar el resultado mientras se tipea.
+
+    Después de cada token guarda el estado del análisis: la pila de
+    operadores pendientes de shunting-yard y la pila de valores con las
+    instrucciones ya evaluadas. Las dos son pilas enlazadas inmutables, así
+    que guardar un estado por token no copia nada. Cuando cambia el texto
+    (``update``) se retoma desde el último token que no pudo cambiar: al
+    agregar una tecla sólo se analiza lo nuevo y las subexpresiones ya
+    evaluadas no se vuelven a calcular.
+
+    Los errores de sintaxis y de cálculo se guardan en el estado: ningún
+    agregado al final puede arreglar "2)" o "1/0+", así que el análisis se
+    detiene ahí hasta que se borre.
+    """
+    def __init__(self, backend="float", precision=DECIMAL_PRECISION, variables=None):
+        self._backend = getBackend(backend)
+        self._precision = precision
+        operations = self._backend.operations
+        self._operations = operations
+        self._negate = (_UNARY_PRECEDENCE, (UNARY, operations["neg"], "neg"))
+        with self._backend.context(precision):
+            if variables and self._backend.convert is not None:
+                variables = {name: self._backend.convert(value) for name, value in variables.items()}
+        self._variables = variables
+        self.text = ""
+        # _ends[i] es dónde termina el token i y _states[i + 1] el estado
+        # después de él: (pending, expectOperand, valores, error)
+        self._ends = []
+        self._states = [(None, True, None, None)]
+
+    def update(self, text):
+        """Pasa a ``text`` reanalizando sólo desde donde cambió respecto del anterior."""
+        old = self.text
+        if text.startswith(old):
+            common = len(old)
+        else:
+            common = 0
+            limit = min(len(old), len(text))
+            while common < limit and old[common] == text[common]:
+                common += 1
+        keep = bisect_right(self._ends, common - _LOOKAHEAD)
+        del self._ends[keep:]
+        del self._states[keep + 1:]
+        self.text = text
+
+        state = self._states[-1]
+        if state[3] is not None:
+            return
+        pos = self._ends[-1] if self._ends else 0
+        with self._backend.context(self._precision):
+            try:
+                for end, token in _scan(text, pos, self._backend.number):
+                    state = self._step(state, token)
+                    self._ends.append(end)
+                    self._states.append(state)
+                    if state[3] is not None:
+                        break
+            except CalcError as e:
+                # Carácter inválido: queda como un token de error hasta el final
+                self._ends.append(len(text))
+                self._states.append((None, True, None, e))
+
+    def _step(self, state, token):
+        pending, expectOperand, values, _ = state
+        emitted = []
+        try:
+            pending, expectOperand = _parseToken(
+                token, self._operations, self._negate, pending, expectOperand, emitted.append
+            )
+            for instruction in emitted:
+                values = _applyInstruction(instruction, values, self._variables)
+        except Exception as e:
+            return (pending, expectOperand, values, e)
+        return (pending, expectOperand, values, None)
+
+    def value(self):
+        """Resultado de lo escrito hasta ahora, cerrando los paréntesis abiertos.
+
+        Lanza ``CalcError`` si la expresión está incompleta o mal formada, o
+        el error del cálculo (división por cero, desborde...).
+        """
+        if len(self.text) > MAX_EXPRESSION_LENGTH:
+            raise CalcError("la expresión es demasiado larga")
+        pending, expectOperand, values, error = self._states[-1]
+        if error is not None:
+            raise error
+        if expectOperand:
+            raise CalcError("la expresión está incompleta")
+        # Los operadores pendientes se aplican sin guardar el resultado: el
+        # próximo token puede cambiar cómo se agrupan
+        with self._backend.context(self._precision):
+            while pending is not None:
+                item, pending = pending
+                if item != "(":
+                    values = _applyInstruction(item[1], values, self._variables)
+        return values[0]
+
+
+# --- Presentación de resultados ---
+
+_DISPLAY_BITS = int(MAX_DISPLAY_DIGITS * math.log2(10))
+
+
+def _log10(n):
+    """log10 de un entero positivo, con la precisión del contexto decimal actual.
+
+    Sólo se usan los 64 bits más altos de ``n`` (no hace falta convertirlo
+    entero a base 10): el resto se suma como bits * log10(2).
+    """
+    shift = max(n.bit_length() - 64, 0)
+    return Decimal(n >> shift).log10() + shift * Decimal(2).log10()
+
+
+def _scientific(numerator, denominator=1):
+    """Notación científica de numerator / denominator (enteros, el segundo positivo)."""
+    with localcontext(Context(prec=40, Emax=MAX_EMAX, Emin=MIN_EMIN)):
+        log = _log10(abs(numerator)) - _log10(denominator)
+        # Se calcula 10 ** log con el exponente completo, así el formato "e"
+        # resuelve el redondeo de la mantisa (9.99... -> 1.00e+N+1)
+        text = f"{Decimal(10) ** log:.{SCIENTIFIC_DIGITS - 1}e}"
+    return "-" + text if numerator < 0 else text
+
+
+def formatResult(value, precision=DECIMAL_PRECISION):
+    """Texto con el que se muestra un resultado.
+
+    ``precision`` es la del motor decimal con la que se calculó ``value``
+    (sirve para saber si un Decimal entero pudo haberse redondeado).
+
+    ``str()`` de un entero tarda un tiempo cuadrático en su cantidad de
+    dígitos (y Python rechaza los de más de 4300), así que los resultados con
+    más de ``MAX_DISPLAY_DIGITS`` dígitos se muestran en notación científica,
+    calculada con logaritmos sin convertir el número completo.
+    """
+    kind = type(value)
+    if kind is int:
+        if value.bit_length() <= _DISPLAY_BITS:
+            return str(value)
+        return _scientific(value)
+    if kind is Fraction:
+        numerator, denominator = value.numerator, value.denominator
+        if numerator.bit_length() > _DISPLAY_BITS or denominator.bit_length() > _DISPLAY_BITS:
+            return _scientific(numerator, denominator)
+        return str(numerator) if denominator == 1 else f"{numerator}/{denominator}"
+    if kind is Decimal:
+        # Los enteros se muestran sin exponente (1.00 -> 1, 2E+5 -> 200000),
+        # salvo los que pueden haberse redondeado a la precisión: 10**30+0.1
+        # con 28 dígitos queda 1.000...E+30 en lugar de un entero que parece exacto
+        if value.is_finite() and value == value.to_integral_value():
+            if value.as_tuple().exponent <= 0 or value.adjusted() < precision:
+                return format(value.to_integral_value(), "f")
+        return str(value)
+    return str(value)
+
+
+# --- Evaluación por columnas (NumPy) ---
+
+# Se arma la primera vez que se usa, para no importar NumPy si no hace falta
+_numpyOperations = None
+
+
+def _numpy():
+    global _numpyOperations
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("evaluateBatch necesita NumPy (pip install numpy)") from e
+    if _numpyOperations is None:
+        _numpyOperations = {
+            "+": np.add,
+            "-": np.subtract,
+            "*": np.multiply,
+            "/": np.true_divide,
+            "//": np.floor_divide,
+            "%": np.mod,
+            "**": np.power,
+            "neg": np.negative,
+        }
+    return np, _numpyOperations
+
+
+def _floatOrInfinity(value):
+    try:
+        return float(value)
+    except OverflowError:
+        return math.inf if value > 0 else -math.inf
+
+
+def _float64(np, value):
+    """Convierte a float64; los enteros de Python que no entran quedan en ±inf.
+
+    Así una fila con un número demasiado grande termina marcada en la máscara
+    de errores, como cualquier otro desborde, en lugar de cortar todo el lote.
+    """
+    try:
+        return np.asarray(value, dtype=np.float64)
+    except OverflowError:
+        converted = np.frompyfunc(_floatOrInfinity, 1, 1)(np.asarray(value, dtype=object))
+        return np.asarray(converted, dtype=np.float64)
+
+
+def evaluateBatch(expression, variables):
+    """Evalúa la expresión una vez por fila sobre columnas de NumPy.
+
+    ``variables`` es un dict nombre -> arreglo (o número, que vale para todas
+    las filas); los arreglos se combinan con las reglas de broadcasting de
+    NumPy. La expresión se compila una sola vez y cada instrucción se aplica
+    a la columna entera. Los cálculos se hacen en ``float64``.
+
+    Devuelve ``(resultados, errores)``: ``errores`` es una máscara booleana
+    con True en las filas cuyo resultado no es un número finito (división por
+    cero, desborde, raíz de un negativo...); en esas filas el resultado es NaN.
+    """
+    np, operations = _numpy()
+    program = compileExpression(expression)
+    columns = {}
+    for name in programVariables(program):
+        if name not in variables:
+            raise CalcError(f"la variable '{name}' no tiene valor")
+        columns[name] = _float64(np, variables[name])
+
+    # Cada elemento de la pila es (valor, propio): los arreglos propios son
+    # resultados intermedios y se pueden sobrescribir (out=) en lugar de
+    # reservar uno nuevo en cada operación. Las operaciones entre escalares
+    # devuelven escalares, que no sirven como out= y no cuentan como propios.
+    ndarray = np.ndarray
+    stack = []
+    with np.errstate(all="ignore"):
+        for kind, _, value in program:
+            if kind == PUSH:
+                stack.append((_float64(np, value), False))
+            elif kind == LOAD:
+                stack.append((columns[value], False))
+            elif kind == UNARY:
+                operand, owned = stack.pop()
+                result = operations[value](operand, out=operand if owned else None)
+                stack.append((result, type(result) is ndarray))
+            else:
+                right, rightOwned = stack.pop()
+                left, leftOwned = stack.pop()
+                shape = np.broadcast_shapes(np.shape(left), np.shape(right))
+                if leftOwned and np.shape(left) == shape:
+                    out = left
+                elif rightOwned and np.shape(right) == shape:
+                    out = right
+                else:
+                    out = None
+                result = operations[value](left, right, out=out)
+                stack.append((result, type(result) is ndarray))
+
+    result, owned = stack[0]
+    if not owned or result.ndim == 0:
+        # Una variable sola, un número o un escalar: se copia para no
+        # modificar los arreglos del llamador al marcar los errores
+        result = np.array(result, dtype=np.float64, ndmin=1)
+    errors = ~np.isfinite(result)
+    result[errors] = np.nan
+    return result, errors